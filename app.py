@@ -5,27 +5,90 @@ This application provides a web interface for predicting customer churn
 using the trained logistic regression model.
 """
 
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, request, jsonify, render_template, g
 from flask_cors import CORS
 import numpy as np
 import joblib
+import atexit
+import hashlib
+import hmac
+import sys
 import os
+import time
 import traceback
 
+# Add src directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from admission import AdmissionController, REJECTED, EXPIRED
+from audit import PredictionAuditLog, SQLiteAuditSink, ParquetAuditSink
+from inference import ChurnScorer, reference_sample
+from profiling import load_profile
+from segments import SegmentedChurnModel, SegmentedScorer
+from shadow import ShadowScorer
+
 app = Flask(__name__)
-CORS(app)  # Enable CORS for all routes
+# Enable CORS for all routes except the admin endpoint
+CORS(app, resources={r'^(?!/api/shadow).*': {}})
+
+# Bearer token required to change runtime state via POST /api/shadow
+ADMIN_TOKEN = os.environ.get('CHURN_ADMIN_TOKEN')
+
+# Static files are cached by browsers; templates add a content hash to
+# their URLs so a changed file is fetched again
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = int(os.environ.get('CHURN_STATIC_MAX_AGE', 31536000))
+
+# Seconds browsers may reuse /api/info before revalidating its ETag
+INFO_MAX_AGE = int(os.environ.get('CHURN_INFO_MAX_AGE', 60))
 
 # Global variables for model and preprocessing objects
 model_data = None
 scaler = None
 feature_names = None
+scorer = None
+
+# Optional challenger scored in the shadow, enabled by CHURN_CHALLENGER_DIR
+shadow = None
+
+# Maximum number of records accepted by /predict/batch
+MAX_BATCH_SIZE = int(os.environ.get('CHURN_MAX_BATCH_SIZE', 1000))
+
+# Admission control: concurrency limit, wait queue and default deadline
+admission = AdmissionController(
+    max_concurrency=int(os.environ.get('CHURN_MAX_CONCURRENCY', 8)),
+    max_queue=int(os.environ.get('CHURN_MAX_QUEUE', 32)),
+    default_timeout=float(os.environ.get('CHURN_DEFAULT_TIMEOUT_MS', 2000)) / 1000.0,
+    retry_after=int(os.environ.get('CHURN_RETRY_AFTER', 1)),
+    max_timeout=float(os.environ.get('CHURN_MAX_TIMEOUT_MS', 30000)) / 1000.0
+)
+
+# Optional prediction audit log, enabled by CHURN_AUDIT_PATH
+audit_log = None
+
+# Startup state reported by /ready
+startup = {
+    'warming_up': False,
+    'warmup_done': False,
+    'warmup_seconds': None,
+    'warmup_requests': 0,
+    'first_request_latency_ms': None
+}
+
+# Endpoints that are never shed, so probes keep working under overload
+UNSHED_ENDPOINTS = {'health_check', 'readiness_check', 'metrics', 'static'}
+
+# Endpoints whose first post-warm-up latency is reported
+PREDICTION_ENDPOINTS = {'predict', 'predict_batch'}
+
+# Modification times and content hashes of static files, used to version their URLs
+static_versions = {}
 
 
 def load_model_artifacts():
     """
     Load the trained model, scaler, and feature names.
     """
-    global model_data, scaler, feature_names
+    global model_data, scaler, feature_names, scorer
     
     try:
         # Load model
@@ -57,6 +120,10 @@ def load_model_artifacts():
             print(f"⚠ Warning: Feature names file not found at {feature_names_path}")
             return False
         
+        # Build the scorer used by the prediction endpoints
+        scorer = ChurnScorer(model_data['model'], scaler, feature_names,
+                             model_version=model_data.get('timestamp', 'N/A'))
+        
         return True
     
     except Exception as e:
@@ -65,6 +132,277 @@ def load_model_artifacts():
         return False
 
 
+def check_reduced_precision():
+    """
+    Warn that CHURN_FLOAT32 does not apply to the web server. Float32 is
+    only faster for batches far larger than CHURN_MAX_BATCH_SIZE allows
+    (see benchmarks/bench_precision.py), so requests are scored in float64
+    and float32 is left to bulk scoring with stream_score.py --float32.
+    """
+    if os.environ.get('CHURN_FLOAT32', '0') == '1':
+        print("⚠ Warning: CHURN_FLOAT32 is ignored by the web server, where float32 is "
+              "slower than float64 at request batch sizes; use stream_score.py --float32 "
+              "for bulk scoring")
+
+
+def load_segment_models():
+    """
+    Serve per-segment models instead of the single model if CHURN_SEGMENTED
+    is set. Segment models are trained with TRAIN_SEGMENT_MODELS in train.py.
+    """
+    global scorer
+    
+    if os.environ.get('CHURN_SEGMENTED', '0') != '1':
+        return
+    
+    segment_path = os.environ.get('CHURN_SEGMENT_MODELS', 'models/segment_models.pkl')
+    if not os.path.exists(segment_path):
+        print(f"⚠ Warning: Segment models not found at {segment_path}, serving the single model")
+        return
+    
+    segmented = SegmentedChurnModel.load(segment_path)
+    if segmented.feature_names != feature_names:
+        print("⚠ Warning: Segment models use different features, serving the single model")
+        return
+    
+    scorer = SegmentedScorer(segmented)
+    n_models = len(segmented.coef) - 1
+    print(f"✓ Segment models loaded ({n_models} segment models + global fallback, "
+          f"segments: {', '.join(segmented.segment_features)})")
+
+
+def load_challenger():
+    """
+    Load a challenger model for shadow scoring if CHURN_CHALLENGER_DIR is set.
+    The directory must contain the same artifact files as models/.
+    """
+    global shadow
+    
+    challenger_dir = os.environ.get('CHURN_CHALLENGER_DIR')
+    if not challenger_dir:
+        return
+    
+    try:
+        challenger = ChurnScorer.from_artifacts(
+            os.path.join(challenger_dir, 'churn_model.pkl'),
+            os.path.join(challenger_dir, 'scaler.pkl'),
+            os.path.join(challenger_dir, 'feature_names.pkl')
+        )
+        shadow = ShadowScorer(scorer, challenger)
+        print(f"✓ Challenger loaded from {challenger_dir} (stacked scoring: {shadow.is_stacked})")
+    except (FileNotFoundError, ValueError) as e:
+        print(f"⚠ Warning: Challenger not loaded: {str(e)}")
+
+
+@app.context_processor
+def static_url_helpers():
+    """
+    Provide static_version() to templates for cache-busting static URLs.
+    """
+    def static_version(filename):
+        path = os.path.join(app.static_folder, filename)
+        mtime = os.path.getmtime(path)
+        if static_versions.get(filename, (None,))[0] != mtime:
+            with open(path, 'rb') as f:
+                static_versions[filename] = (mtime, hashlib.md5(f.read()).hexdigest()[:8])
+        return static_versions[filename][1]
+    return {'static_version': static_version}
+
+
+def active_scorer():
+    """
+    Scorer used for requests: the shadow pair if a challenger is loaded.
+    """
+    return shadow if shadow is not None else scorer
+
+
+def audit_prediction(features, prediction, probability, start_time):
+    """
+    Record a served prediction in the audit log, if enabled.
+    """
+    if audit_log is not None and not startup['warming_up']:
+        audit_log.record(
+            features=features,
+            prediction=prediction,
+            probability=probability,
+            latency_ms=(time.perf_counter() - start_time) * 1000,
+            model_version=scorer.model_version
+        )
+
+
+def format_prediction(prediction, churn_probability):
+    """
+    Response fields describing one prediction.
+    """
+    return {
+        'prediction': int(prediction),
+        'prediction_label': 'Churn' if prediction == 1 else 'Not Churn',
+        'probability': {
+            'not_churn': round((1 - float(churn_probability)) * 100, 2),
+            'churn': round(float(churn_probability) * 100, 2)
+        }
+    }
+
+
+def start_audit_log():
+    """
+    Start the prediction audit log if CHURN_AUDIT_PATH is set.
+    """
+    global audit_log
+    
+    audit_path = os.environ.get('CHURN_AUDIT_PATH')
+    if not audit_path:
+        return
+    
+    audit_format = os.environ.get('CHURN_AUDIT_FORMAT', 'sqlite')
+    if audit_format == 'sqlite':
+        sink = SQLiteAuditSink(audit_path)
+    elif audit_format == 'parquet':
+        max_files = os.environ.get('CHURN_AUDIT_MAX_FILES')
+        sink = ParquetAuditSink(
+            audit_path,
+            rotate_interval=float(os.environ.get('CHURN_AUDIT_ROTATE_SECONDS', 300)),
+            max_files=int(max_files) if max_files else None
+        )
+    else:
+        print(f"⚠ Warning: Unknown audit format '{audit_format}', audit log disabled")
+        return
+    
+    try:
+        audit_log = PredictionAuditLog(
+            sink,
+            capacity=int(os.environ.get('CHURN_AUDIT_CAPACITY', 10000)),
+            overflow=os.environ.get('CHURN_AUDIT_OVERFLOW', 'drop_oldest'),
+            flush_interval=float(os.environ.get('CHURN_AUDIT_FLUSH_INTERVAL', 1.0))
+        )
+    except ValueError as e:
+        print(f"⚠ Warning: {str(e)}, audit log disabled")
+        return
+    
+    try:
+        audit_log.start()
+    except RuntimeError as e:
+        print(f"✗ Error: {str(e)}, audit log disabled")
+        audit_log = None
+        return
+    atexit.register(audit_log.stop)
+    print(f"✓ Audit log enabled ({audit_format}: {audit_path})")
+
+
+def warm_up():
+    """
+    Send synthetic requests through the full request path so that lazy
+    imports, template compilation, validation caches and first-call
+    allocations happen before real traffic arrives.
+    
+    Returns:
+    --------
+    bool
+        True if every warm-up request succeeded
+    """
+    n_requests = int(os.environ.get('CHURN_WARMUP_REQUESTS', 50))
+    start = time.perf_counter()
+    startup['warming_up'] = True
+    
+    try:
+        sample = reference_sample(feature_names, scaler, load_profile('models/data_profile.json'),
+                                  n_samples=max(n_requests, 1))
+        records = [dict(zip(feature_names, row.tolist())) for row in sample]
+        
+        client = app.test_client()
+        responses = [client.get('/'), client.get('/api/info')]
+        responses += [client.post('/predict', json=record) for record in records[:n_requests]]
+        responses.append(client.post('/predict/batch', json={'records': records[:MAX_BATCH_SIZE]}))
+        
+        failed = [r for r in responses if r.status_code != 200]
+        if failed:
+            print(f"✗ Warm-up failed: {len(failed)} of {len(responses)} requests returned errors")
+            for r in failed[:5]:
+                print(f"  {r.request.path}: {r.status_code} {r.get_data(as_text=True)[:200]}")
+            return False
+        
+        # Synthetic traffic must not count towards challenger statistics
+        if shadow is not None:
+            shadow.stats.reset()
+    except Exception as e:
+        print(f"✗ Warm-up failed: {str(e)}")
+        traceback.print_exc()
+        return False
+    finally:
+        startup['warming_up'] = False
+    
+    startup['warmup_seconds'] = time.perf_counter() - start
+    startup['warmup_requests'] = len(responses)
+    startup['warmup_done'] = True
+    print(f"✓ Warm-up completed: {len(responses)} requests in "
+          f"{startup['warmup_seconds'] * 1000:.1f} ms")
+    return True
+
+
+@app.before_request
+def admit_request():
+    """
+    Apply admission control before a request reaches its view.
+    """
+    g.start_time = time.perf_counter()
+    if request.endpoint in UNSHED_ENDPOINTS:
+        return None
+    
+    try:
+        deadline = admission.deadline_from_headers(request.headers)
+    except ValueError:
+        return jsonify({
+            'success': False,
+            'error': 'Invalid request deadline header'
+        }), 400
+    
+    outcome = admission.acquire(deadline)
+    if outcome == REJECTED:
+        response = jsonify({
+            'success': False,
+            'error': 'Server overloaded. Please retry later.'
+        })
+        response.headers['Retry-After'] = str(admission.retry_after)
+        return response, 503
+    if outcome == EXPIRED:
+        return deadline_exceeded()
+    
+    g.admitted = True
+    g.deadline = deadline
+    return None
+
+
+@app.after_request
+def record_first_request(response):
+    """
+    Record the latency of the first real prediction request after warm-up.
+    """
+    if (startup['warmup_done'] and startup['first_request_latency_ms'] is None
+            and request.endpoint in PREDICTION_ENDPOINTS and 'start_time' in g):
+        startup['first_request_latency_ms'] = (time.perf_counter() - g.start_time) * 1000
+        print(f"✓ First request served in {startup['first_request_latency_ms']:.2f} ms")
+    return response
+
+
+@app.teardown_request
+def release_request(exc):
+    """
+    Release the admission slot held by the request, if any.
+    """
+    if g.pop('admitted', False):
+        admission.release()
+
+
+def deadline_exceeded():
+    """
+    Response for requests dropped because their deadline passed.
+    """
+    return jsonify({
+        'success': False,
+        'error': 'Request deadline exceeded'
+    }), 504
+
+
 @app.route('/')
 def home():
     """
@@ -79,9 +417,10 @@ def predict():
     API endpoint for making predictions
     Accepts JSON data with customer features
     """
+    start_time = time.perf_counter()
     try:
         # Check if model is loaded
-        if model_data is None or scaler is None or feature_names is None:
+        if scorer is None:
             return jsonify({
                 'success': False,
                 'error': 'Model not loaded. Please train the model first.'
@@ -104,8 +443,13 @@ def predict():
         for feature_name in feature_names:
             if feature_name in data:
                 try:
-                    features.append(float(data[feature_name]))
-                except (ValueError, TypeError):
+                    value = float(data[feature_name])
+                    # nan and inf parse as floats but cannot be scored
+                    with np.errstate(over='ignore'):
+                        if not np.isfinite(scorer.dtype(value)):
+                            raise ValueError(feature_name)
+                    features.append(value)
+                except (ValueError, TypeError, OverflowError):
                     return jsonify({
                         'success': False,
                         'error': f'Invalid value for feature: {feature_name}'
@@ -119,28 +463,28 @@ def predict():
                 'error': f'Missing required features: {", ".join(missing_features)}'
             }), 400
         
-        # Convert to numpy array and reshape
-        features_array = np.array(features).reshape(1, -1)
+        # Drop the request if its deadline passed while it was queued
+        if admission.is_expired(g.deadline):
+            admission.record_expired()
+            return deadline_exceeded()
         
-        # Scale features
-        features_scaled = scaler.transform(features_array)
+        # Convert to numpy array and reshape
+        features_array = np.array(features, dtype=scorer.dtype).reshape(1, -1)
         
         # Make prediction
-        prediction = model_data['model'].predict(features_scaled)[0]
-        probability = model_data['model'].predict_proba(features_scaled)[0]
+        predictions, probabilities = active_scorer().predict(features_array)
+        prediction, churn_probability = int(predictions[0]), float(probabilities[0])
         
         # Prepare response
         result = {
             'success': True,
-            'prediction': int(prediction),
-            'prediction_label': 'Churn' if prediction == 1 else 'Not Churn',
-            'probability': {
-                'not_churn': round(float(probability[0]) * 100, 2),
-                'churn': round(float(probability[1]) * 100, 2)
-            },
+            **format_prediction(prediction, churn_probability),
             'input_features': data
         }
         
+        audit_prediction(dict(zip(feature_names, features)), prediction,
+                         churn_probability, start_time)
+        
         return jsonify(result), 200
     
     except Exception as e:
@@ -152,6 +496,83 @@ def predict():
         }), 500
 
 
+@app.route('/predict/batch', methods=['POST'])
+def predict_batch():
+    """
+    API endpoint for scoring several customers in one request
+    Accepts JSON data of the form {"records": [{...}, ...]}
+    """
+    start_time = time.perf_counter()
+    try:
+        # Check if model is loaded
+        if scorer is None:
+            return jsonify({
+                'success': False,
+                'error': 'Model not loaded. Please train the model first.'
+            }), 500
+        
+        # Get data from request
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({
+                'success': False,
+                'error': 'Request body must be a JSON object'
+            }), 400
+        records = data.get('records')
+        
+        # Validate input
+        if not isinstance(records, list) or not records:
+            return jsonify({
+                'success': False,
+                'error': 'No records provided'
+            }), 400
+        
+        if len(records) > MAX_BATCH_SIZE:
+            return jsonify({
+                'success': False,
+                'error': f'Too many records: {len(records)} (maximum {MAX_BATCH_SIZE})'
+            }), 400
+        
+        # Extract features of all valid records into one matrix
+        features_array, errors = scorer.records_to_matrix(records)
+        
+        # Drop the request if its deadline passed while it was queued
+        if admission.is_expired(g.deadline):
+            admission.record_expired()
+            return deadline_exceeded()
+        
+        # Score all valid records in one pass
+        predictions, probabilities = active_scorer().predict(features_array)
+        
+        # Prepare response, keeping the order of the input records
+        results = []
+        row = 0
+        for i in range(len(records)):
+            if i in errors:
+                results.append({'success': False, 'error': errors[i]})
+                continue
+            
+            results.append({'success': True, **format_prediction(predictions[row], probabilities[row])})
+            # Audit the parsed inputs rather than the scoring matrix
+            audit_prediction({name: float(records[i][name]) for name in feature_names},
+                             int(predictions[row]), float(probabilities[row]), start_time)
+            row += 1
+        
+        return jsonify({
+            'success': True,
+            'count': len(results),
+            'results': results
+        }), 200
+    
+    except Exception as e:
+        print(f"Error during batch prediction: {str(e)}")
+        traceback.print_exc()
+        return jsonify({
+            'success': False,
+            'error': f'Prediction error: {str(e)}'
+        }), 500
+
+
 @app.route('/api/info', methods=['GET'])
 def model_info():
     """
@@ -166,14 +587,21 @@ def model_info():
         
         info = {
             'success': True,
-            'model_type': 'Logistic Regression',
+            'model_type': model_data.get('model_type', 'Logistic Regression'),
+            'segmented': isinstance(scorer, SegmentedScorer),
             'features': feature_names,
             'num_features': len(feature_names),
+            'max_batch_size': MAX_BATCH_SIZE,
             'best_params': model_data.get('best_params', {}),
             'timestamp': model_data.get('timestamp', 'N/A')
         }
         
-        return jsonify(info), 200
+        # Let browsers reuse the response and revalidate it with its ETag
+        response = jsonify(info)
+        response.add_etag()
+        response.cache_control.public = True
+        response.cache_control.max_age = INFO_MAX_AGE
+        return response.make_conditional(request)
     
     except Exception as e:
         return jsonify({
@@ -185,15 +613,106 @@ def model_info():
 @app.route('/health', methods=['GET'])
 def health_check():
     """
-    Health check endpoint.
+    Health check (liveness) endpoint.
+    Reports that the process responds; use /ready before routing traffic.
     """
     return jsonify({
         'status': 'healthy',
+        'ready': is_ready(),
         'model_loaded': model_data is not None,
         'scaler_loaded': scaler is not None
     }), 200
 
 
+def is_ready():
+    """
+    Whether the artifacts are loaded and warm-up has finished.
+    """
+    return scorer is not None and startup['warmup_done']
+
+
+@app.route('/ready', methods=['GET'])
+def readiness_check():
+    """
+    Readiness endpoint.
+    Returns 200 only once the artifacts are loaded and warm-up has finished.
+    """
+    return jsonify({
+        'ready': is_ready(),
+        'model_loaded': scorer is not None,
+        'warmup_done': startup['warmup_done'],
+        'warmup_ms': round(startup['warmup_seconds'] * 1000, 2) if startup['warmup_seconds'] else None,
+        'first_request_latency_ms': (
+            round(startup['first_request_latency_ms'], 3)
+            if startup['first_request_latency_ms'] is not None else None
+        )
+    }), 200 if is_ready() else 503
+
+
+def is_admin_request():
+    """
+    Whether the request carries the admin token. Always False when
+    CHURN_ADMIN_TOKEN is not set.
+    """
+    if not ADMIN_TOKEN:
+        return False
+    auth = request.headers.get('Authorization', '')
+    scheme, _, token = auth.partition(' ')
+    return scheme.lower() == 'bearer' and hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode())
+
+
+@app.route('/api/shadow', methods=['GET', 'POST'])
+def shadow_control():
+    """
+    API endpoint to inspect shadow scoring or switch it on and off
+    Accepts JSON data of the form {"enabled": true|false}
+    """
+    if shadow is None:
+        return jsonify({
+            'success': False,
+            'error': 'No challenger loaded. Set CHURN_CHALLENGER_DIR to enable shadow scoring.'
+        }), 404
+    
+    if request.method == 'POST':
+        if not is_admin_request():
+            return jsonify({
+                'success': False,
+                'error': 'Changing shadow scoring requires CHURN_ADMIN_TOKEN as a Bearer token'
+            }), 403
+        data = request.get_json(silent=True) or {}
+        if not isinstance(data.get('enabled'), bool):
+            return jsonify({
+                'success': False,
+                'error': "Field 'enabled' must be true or false"
+            }), 400
+        shadow.enabled = data['enabled']
+        if data.get('reset_stats'):
+            shadow.stats.reset()
+    
+    return jsonify({
+        'success': True,
+        **shadow.metrics()
+    }), 200
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """
+    Serving metrics endpoint.
+    """
+    return jsonify({
+        'startup': {
+            'ready': is_ready(),
+            'warmup_ms': round(startup['warmup_seconds'] * 1000, 2) if startup['warmup_seconds'] else None,
+            'warmup_requests': startup['warmup_requests'],
+            'first_request_latency_ms': startup['first_request_latency_ms']
+        },
+        'admission': admission.metrics(),
+        'audit': audit_log.metrics() if audit_log is not None else {'enabled': False},
+        'shadow': shadow.metrics() if shadow is not None else {'enabled': False}
+    }), 200
+
+
 if __name__ == '__main__':
     print("\n" + "="*80)
     print("TELECOM CHURN PREDICTION - WEB APPLICATION")
@@ -203,6 +722,14 @@ if __name__ == '__main__':
     print("\nLoading model artifacts...")
     if load_model_artifacts():
         print("\n✓ All artifacts loaded successfully!")
+        load_segment_models()
+        check_reduced_precision()
+        load_challenger()
+        start_audit_log()
+        print("\nWarming up...")
+        if not warm_up():
+            print("\n✗ Warm-up failed, so /ready would never report ready. Exiting.")
+            sys.exit(1)
         print("\nStarting Flask server...")
         print("="*80)
         print("\n🌐 Application running at: http://localhost:5000")
@@ -0,0 +1,68 @@
+"""
+Float32 vs Float64 Scoring Benchmark
+------------------------------------
+Compares scoring throughput of the fused linear path in float64 and
+float32 on synthetic rows drawn from the saved data profile.
+
+Usage (from the project root):
+    python benchmarks/bench_precision.py
+"""
+
+import sys
+import os
+import time
+import numpy as np
+
+# Add src directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from inference import ChurnScorer, reference_sample
+from profiling import load_profile
+
+
+BATCH_SIZES = [1, 64, 1024, 16384, 262144]
+MIN_SECONDS = 0.5
+
+
+def rows_per_second(scorer, X):
+    """
+    Repeat predict_proba on X for at least MIN_SECONDS and return rows/s.
+    """
+    scorer.predict_proba(X)
+    n_calls = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < MIN_SECONDS:
+        scorer.predict_proba(X)
+        n_calls += 1
+    return n_calls * len(X) / (time.perf_counter() - start)
+
+
+def main():
+    """
+    Run the benchmark and print a throughput table.
+    """
+    scorer64 = ChurnScorer.from_artifacts()
+    scorer32 = ChurnScorer.from_artifacts()
+    profile = load_profile()
+
+    sample = reference_sample(scorer32.feature_names, scorer32.scaler, profile)
+    enabled, max_abs_diff = scorer32.enable_reduced_precision(sample)
+    if not enabled:
+        print("✗ Float32 scoring could not be enabled for this model")
+        sys.exit(1)
+    print(f"✓ Float32 enabled (max probability difference: {max_abs_diff:.2e})")
+
+    data = reference_sample(scorer64.feature_names, scorer64.scaler, profile,
+                            n_samples=max(BATCH_SIZES), random_state=1)
+
+    print(f"\n{'Batch size':>10} {'float64 rows/s':>16} {'float32 rows/s':>16} {'Speedup':>8}")
+    for batch_size in BATCH_SIZES:
+        X64 = data[:batch_size]
+        X32 = X64.astype(np.float32)
+        rate64 = rows_per_second(scorer64, X64)
+        rate32 = rows_per_second(scorer32, X32)
+        print(f"{batch_size:>10} {rate64:>16,.0f} {rate32:>16,.0f} {rate32 / rate64:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Segmented Scoring Benchmark
+---------------------------
+Compares scoring throughput of the single fused model, the segmented
+model with its precomputed routing table, and a naive per-segment loop
+that masks the batch once per segment model.
+
+Segment models are loaded from models/segment_models.pkl, or fitted on
+telecom_churn.csv with the saved scaler when that file does not exist.
+
+Usage (from the project root):
+    python benchmarks/bench_segments.py
+"""
+
+import sys
+import os
+import time
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+
+# Add src directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from inference import ChurnScorer, sigmoid
+from segments import SegmentedChurnModel, SegmentedScorer
+
+
+BATCH_SIZES = [1, 64, 1024, 16384, 262144]
+MIN_SECONDS = 0.5
+SEGMENT_MODELS_PATH = 'models/segment_models.pkl'
+
+
+def rows_per_second(predict_proba, X):
+    """
+    Repeat predict_proba on X for at least MIN_SECONDS and return rows/s.
+    """
+    predict_proba(X)
+    n_calls = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < MIN_SECONDS:
+        predict_proba(X)
+        n_calls += 1
+    return n_calls * len(X) / (time.perf_counter() - start)
+
+
+def per_segment_loop(segmented):
+    """
+    Baseline scorer that selects each segment's rows with a boolean mask
+    and scores them with that segment's coefficients.
+    """
+    def predict_proba(X):
+        rows = segmented.route(X)
+        proba = np.empty(len(X))
+        for row in range(len(segmented.coef)):
+            mask = rows == row
+            proba[mask] = sigmoid(X[mask] @ segmented.coef[row] + segmented.intercept[row])
+        return proba
+    return predict_proba
+
+
+def load_or_fit_segments(scorer):
+    """
+    Load the saved segment models, fitting them on the training split if needed.
+    """
+    if os.path.exists(SEGMENT_MODELS_PATH):
+        return SegmentedChurnModel.load(SEGMENT_MODELS_PATH)
+
+    data = pd.read_csv('telecom_churn.csv')
+    X = data[scorer.feature_names]
+    y = data['Churn']
+    X_train, _, y_train, _ = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+    return SegmentedChurnModel(scorer.feature_names).fit(X_train, y_train, scorer.scaler)
+
+
+def main():
+    """
+    Run the benchmark and print a throughput table.
+    """
+    single = ChurnScorer.from_artifacts()
+    segmented = load_or_fit_segments(single)
+    routed = SegmentedScorer(segmented)
+    looped = per_segment_loop(segmented)
+
+    # Resample real customers so every segment appears in its natural mix
+    data = pd.read_csv('telecom_churn.csv')[single.feature_names].to_numpy(dtype=np.float64)
+    rng = np.random.default_rng(1)
+    data = data[rng.integers(0, len(data), size=max(BATCH_SIZES))]
+
+    max_abs_diff = float(np.abs(routed.predict_proba(data) - looped(data)).max())
+    print(f"\n✓ Routed and per-segment scores agree (max difference: {max_abs_diff:.2e})")
+
+    print(f"\n{'Batch size':>10} {'single rows/s':>15} {'routed rows/s':>15} "
+          f"{'loop rows/s':>15} {'Routed/loop':>11}")
+    for batch_size in BATCH_SIZES:
+        X = data[:batch_size]
+        rate_single = rows_per_second(single.predict_proba, X)
+        rate_routed = rows_per_second(routed.predict_proba, X)
+        rate_loop = rows_per_second(looped, X)
+        print(f"{batch_size:>10} {rate_single:>15,.0f} {rate_routed:>15,.0f} "
+              f"{rate_loop:>15,.0f} {rate_routed / rate_loop:>10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+Admission Control Module
+------------------------
+This module bounds the number of requests the serving layer works on at
+once and enforces per-request deadlines.
+
+Requests beyond the concurrency limit wait in a bounded queue until a slot
+frees up or their deadline passes. When the queue is full new requests are
+rejected immediately so that callers can back off instead of piling up.
+"""
+
+import math
+import threading
+import time
+
+
+ADMITTED = 'admitted'
+REJECTED = 'rejected'
+EXPIRED = 'expired'
+
+DEADLINE_HEADER = 'X-Request-Deadline'
+TIMEOUT_HEADER = 'X-Request-Timeout-Ms'
+
+
+class AdmissionController:
+    """
+    A class to handle concurrency limits, queueing and deadlines.
+    """
+
+    def __init__(self, max_concurrency=8, max_queue=32, default_timeout=2.0, retry_after=1,
+                 max_timeout=30.0):
+        """
+        Initialize the controller.
+
+        Parameters:
+        -----------
+        max_concurrency : int
+            Maximum number of requests processed at the same time
+        max_queue : int
+            Maximum number of requests waiting for a free slot
+        default_timeout : float
+            Deadline in seconds for requests that do not send one
+        retry_after : int
+            Seconds suggested to rejected callers via Retry-After
+        max_timeout : float
+            Upper bound in seconds on any client-supplied deadline
+        """
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.default_timeout = default_timeout
+        self.retry_after = retry_after
+        self.max_timeout = max_timeout
+
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.waiting = 0
+        self.stats = {
+            'admitted': 0,
+            'rejected': 0,
+            'expired': 0
+        }
+
+    def deadline_from_headers(self, headers):
+        """
+        Compute the absolute deadline of a request.
+
+        An absolute deadline (Unix time in seconds) is read from the
+        X-Request-Deadline header, a relative one from X-Request-Timeout-Ms.
+        Without either header the default timeout applies. Deadlines further
+        away than max_timeout are capped.
+
+        Parameters:
+        -----------
+        headers : Mapping
+            Request headers
+
+        Returns:
+        --------
+        float
+            Deadline as Unix time in seconds
+
+        Raises:
+        -------
+        ValueError
+            If a deadline header cannot be parsed or is not finite
+        """
+        now = time.time()
+        if DEADLINE_HEADER in headers:
+            deadline = float(headers[DEADLINE_HEADER])
+        elif TIMEOUT_HEADER in headers:
+            deadline = now + float(headers[TIMEOUT_HEADER]) / 1000.0
+        else:
+            deadline = now + self.default_timeout
+
+        if not math.isfinite(deadline):
+            raise ValueError('Request deadline must be a finite number')
+        return min(deadline, now + self.max_timeout)
+
+    def is_expired(self, deadline):
+        """Whether the deadline has already passed."""
+        return time.time() >= deadline
+
+    def acquire(self, deadline):
+        """
+        Try to admit a request, waiting in the queue until its deadline.
+
+        Parameters:
+        -----------
+        deadline : float
+            Deadline as Unix time in seconds
+
+        Returns:
+        --------
+        str
+            ADMITTED, REJECTED (queue full) or EXPIRED (deadline passed)
+
+        Raises:
+        -------
+        ValueError
+            If the deadline is not finite
+        """
+        if not math.isfinite(deadline):
+            raise ValueError('Request deadline must be a finite number')
+        deadline = min(deadline, time.time() + self.max_timeout)
+
+        if self.is_expired(deadline):
+            self.record_expired()
+            return EXPIRED
+
+        admitted = self._slots.acquire(blocking=False)
+        if not admitted:
+            with self._lock:
+                if self.waiting >= self.max_queue:
+                    self.stats['rejected'] += 1
+                    return REJECTED
+                self.waiting += 1
+            try:
+                admitted = self._slots.acquire(timeout=max(deadline - time.time(), 0))
+            finally:
+                with self._lock:
+                    self.waiting -= 1
+
+        if not admitted:
+            self.record_expired()
+            return EXPIRED
+
+        with self._lock:
+            self.in_flight += 1
+            self.stats['admitted'] += 1
+        return ADMITTED
+
+    def release(self):
+        """
+        Free the slot held by an admitted request.
+        """
+        with self._lock:
+            self.in_flight -= 1
+        self._slots.release()
+
+    def record_expired(self):
+        """
+        Count a request dropped because its deadline passed.
+        """
+        with self._lock:
+            self.stats['expired'] += 1
+
+    def metrics(self):
+        """
+        Snapshot of the admission counters.
+
+        Returns:
+        --------
+        dict
+            Limits, current load and cumulative counters
+        """
+        with self._lock:
+            return {
+                'max_concurrency': self.max_concurrency,
+                'max_queue': self.max_queue,
+                'default_timeout_ms': int(self.default_timeout * 1000),
+                'max_timeout_ms': int(self.max_timeout * 1000),
+                'in_flight': self.in_flight,
+                'waiting': self.waiting,
+                **self.stats
+            }
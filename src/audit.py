@@ -0,0 +1,432 @@
+"""
+Prediction Audit Module
+-----------------------
+This module records served predictions without adding disk latency to the
+request path.
+
+The request thread only appends a record to an in-memory ring buffer. A
+background writer thread drains the buffer and writes the records in bulk,
+either as one SQLite transaction per flush or as row groups appended to
+Parquet files that are rotated on a time interval.
+"""
+
+from collections import deque
+from datetime import datetime
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+OVERFLOW_POLICIES = ('drop_oldest', 'drop_newest', 'block')
+
+
+class SQLiteAuditSink:
+    """
+    A class to write audit records to a SQLite database.
+    """
+
+    def __init__(self, path):
+        """
+        Initialize the sink.
+
+        Parameters:
+        -----------
+        path : str
+            Path to the SQLite database file
+        """
+        self.path = path
+        self.connection = None
+
+    def open(self):
+        """
+        Open the database and create the table. Called from the writer thread.
+        """
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS predictions ('
+            'id INTEGER PRIMARY KEY AUTOINCREMENT, '
+            'timestamp TEXT, model_version TEXT, features TEXT, '
+            'prediction INTEGER, probability REAL, latency_ms REAL)'
+        )
+        self.connection.commit()
+
+    def write(self, records):
+        """
+        Write a batch of records in a single transaction.
+        """
+        rows = [
+            (r['timestamp'], r['model_version'], json.dumps(r['features']),
+             r['prediction'], r['probability'], r['latency_ms'])
+            for r in records
+        ]
+        with self.connection:
+            self.connection.executemany(
+                'INSERT INTO predictions (timestamp, model_version, features, '
+                'prediction, probability, latency_ms) VALUES (?, ?, ?, ?, ?, ?)',
+                rows
+            )
+
+    def tick(self):
+        """
+        Periodic hook called by the writer thread; nothing to do for SQLite.
+        """
+
+    def close(self):
+        """
+        Close the database connection.
+        """
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+
+class ParquetAuditSink:
+    """
+    A class to write audit records to time-rotated Parquet files.
+    """
+
+    def __init__(self, directory, rotate_interval=300.0, max_files=None):
+        """
+        Initialize the sink.
+
+        Parameters:
+        -----------
+        directory : str
+            Directory receiving the Parquet files
+        rotate_interval : float
+            Seconds after which the current file is closed and a new one
+            started; each flush is appended to the current file as a row
+            group, and a file is readable once it has been closed
+        max_files : int or None
+            Number of most recent files kept. None (the default) keeps
+            every file; records in deleted files are counted in
+            removed_records
+        """
+        self.directory = directory
+        self.rotate_interval = rotate_interval
+        self.max_files = max_files
+        self.removed_records = 0
+        self._sequence = 0
+        self._writer = None
+        self._opened_at = None
+
+    def open(self):
+        """
+        Create the output directory. Called from the writer thread.
+        """
+        # Row groups are appended with pyarrow's ParquetWriter
+        import pyarrow.parquet  # noqa: F401
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _close_file(self):
+        """
+        Close the current file, then apply the retention limit.
+        """
+        import pyarrow.parquet as pq
+
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+        if self.max_files is None:
+            return
+        files = sorted(f for f in os.listdir(self.directory) if f.endswith('.parquet'))
+        for old in files[:-self.max_files]:
+            path = os.path.join(self.directory, old)
+            try:
+                self.removed_records += pq.read_metadata(path).num_rows
+            except Exception:
+                pass
+            os.remove(path)
+
+    def write(self, records):
+        """
+        Append a batch of records to the current file as one row group,
+        starting a new file when the rotation interval has passed.
+        """
+        import pandas as pd
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        frame = pd.DataFrame([
+            {
+                'timestamp': r['timestamp'],
+                'model_version': r['model_version'],
+                'prediction': r['prediction'],
+                'probability': r['probability'],
+                'latency_ms': r['latency_ms'],
+                **r['features']
+            }
+            for r in records
+        ])
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+
+        if self._writer is not None and (
+                self._expired() or not table.schema.equals(self._writer.schema)):
+            self._close_file()
+
+        if self._writer is None:
+            self._sequence += 1
+            name = f"predictions-{datetime.now().strftime('%Y%m%d-%H%M%S')}-{self._sequence:06d}.parquet"
+            self._writer = pq.ParquetWriter(os.path.join(self.directory, name), table.schema)
+            self._opened_at = time.monotonic()
+
+        self._writer.write_table(table)
+
+    def _expired(self):
+        """
+        Whether the current file has been open for the rotation interval.
+        """
+        return time.monotonic() - self._opened_at >= self.rotate_interval
+
+    def tick(self):
+        """
+        Close the current file once the rotation interval has passed, so
+        files are finalized and readable even when traffic stops.
+        """
+        if self._writer is not None and self._expired():
+            self._close_file()
+
+    def close(self):
+        """
+        Close the current file.
+        """
+        self._close_file()
+
+
+class PredictionAuditLog:
+    """
+    A class to buffer audit records and flush them from a background thread.
+    """
+
+    def __init__(self, sink, capacity=10000, overflow='drop_oldest',
+                 flush_interval=1.0, flush_size=500, block_timeout=0.05):
+        """
+        Initialize the audit log.
+
+        Parameters:
+        -----------
+        sink : SQLiteAuditSink or ParquetAuditSink
+            Destination of the flushed records
+        capacity : int
+            Maximum number of records held in memory
+        overflow : str
+            What to do when the buffer is full: 'drop_oldest' evicts the
+            oldest record, 'drop_newest' discards the new record and
+            'block' waits up to block_timeout for space before discarding
+        flush_interval : float
+            Maximum seconds between flushes
+        flush_size : int
+            Number of buffered records that triggers an early flush
+        block_timeout : float
+            Maximum seconds a request waits for space under 'block'
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_POLICIES}, got '{overflow}'")
+
+        self.sink = sink
+        self.capacity = capacity
+        self.overflow = overflow
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+        self.block_timeout = block_timeout
+
+        self._buffer = deque()
+        self._condition = threading.Condition()
+        self._stopping = False
+        self._thread = None
+        self._opened = threading.Event()
+        self.sink_error = None
+        self.last_flush_time = None
+        self.last_flush_duration = 0.0
+        self.stats = {
+            'enqueued': 0,
+            'written': 0,
+            'dropped': 0,
+            'flushes': 0,
+            'flush_errors': 0
+        }
+
+    def start(self):
+        """
+        Start the background writer thread and wait until it has opened
+        the sink.
+
+        Raises:
+        -------
+        RuntimeError
+            If the sink cannot be opened
+        """
+        self._thread = threading.Thread(target=self._run, name='audit-writer', daemon=True)
+        self._thread.start()
+        self._opened.wait()
+        if self.sink_error is not None:
+            self._thread.join()
+            self._thread = None
+            raise RuntimeError(f'Cannot open audit sink: {self.sink_error}')
+
+    def stop(self, timeout=10.0):
+        """
+        Flush the remaining records and stop the writer thread.
+        """
+        if self._thread is None:
+            return
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def record(self, features, prediction, probability, latency_ms, model_version):
+        """
+        Enqueue one prediction. Never touches the disk.
+
+        Parameters:
+        -----------
+        features : dict
+            Model input features
+        prediction : int
+            Predicted label
+        probability : float
+            Predicted churn probability
+        latency_ms : float
+            Request latency in milliseconds
+        model_version : str
+            Version of the model that served the prediction
+        """
+        entry = {
+            'timestamp': datetime.now().isoformat(timespec='milliseconds'),
+            'model_version': model_version,
+            'features': features,
+            'prediction': int(prediction),
+            'probability': float(probability),
+            'latency_ms': float(latency_ms),
+            '_enqueued_at': time.monotonic()
+        }
+
+        with self._condition:
+            # Nothing drains the buffer once the writer has stopped
+            if self._stopping:
+                self.stats['dropped'] += 1
+                return
+
+            if len(self._buffer) >= self.capacity:
+                if self.overflow == 'drop_oldest':
+                    self._buffer.popleft()
+                    self.stats['dropped'] += 1
+                elif self.overflow == 'block':
+                    self._condition.wait_for(
+                        lambda: self._stopping or len(self._buffer) < self.capacity,
+                        timeout=self.block_timeout
+                    )
+                if len(self._buffer) >= self.capacity:
+                    self.stats['dropped'] += 1
+                    return
+
+            self._buffer.append(entry)
+            self.stats['enqueued'] += 1
+            if len(self._buffer) >= self.flush_size:
+                self._condition.notify_all()
+
+    def _run(self):
+        """
+        Writer loop: wait for a flush trigger, drain the buffer, write it.
+        """
+        try:
+            self.sink.open()
+        except Exception as e:
+            with self._condition:
+                self.sink_error = str(e)
+                self._stopping = True
+                self.stats['dropped'] += len(self._buffer)
+                self._buffer.clear()
+                self._condition.notify_all()
+            self._opened.set()
+            return
+        self._opened.set()
+
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._stopping or len(self._buffer) >= self.flush_size,
+                    timeout=self.flush_interval
+                )
+                batch = list(self._buffer)
+                self._buffer.clear()
+                stopping = self._stopping
+                self._condition.notify_all()
+
+            if batch:
+                self._flush(batch)
+            if stopping:
+                break
+            self._tick()
+
+        self.sink.close()
+
+    def _tick(self):
+        """
+        Let the sink do periodic work, such as closing an expired file.
+        """
+        try:
+            self.sink.tick()
+        except Exception as e:
+            print(f"✗ Error in audit sink: {str(e)}")
+
+    def _flush(self, batch):
+        """
+        Write a drained batch to the sink and update the flush metrics.
+        """
+        start = time.perf_counter()
+        try:
+            self.sink.write(batch)
+            failed = False
+        except Exception as e:
+            print(f"✗ Error writing audit records: {str(e)}")
+            failed = True
+
+        with self._condition:
+            if failed:
+                self.stats['flush_errors'] += 1
+                self.stats['dropped'] += len(batch)
+            else:
+                self.stats['written'] += len(batch)
+            self.stats['flushes'] += 1
+            self.last_flush_duration = time.perf_counter() - start
+            self.last_flush_time = time.monotonic()
+
+    def metrics(self):
+        """
+        Snapshot of the audit log metrics.
+
+        Returns:
+        --------
+        dict
+            Queue size, flush lag and cumulative counters
+        """
+        now = time.monotonic()
+        with self._condition:
+            queue_size = len(self._buffer)
+            oldest = self._buffer[0]['_enqueued_at'] if self._buffer else None
+            stats = dict(self.stats)
+
+        return {
+            'running': self._thread is not None and not self._stopping,
+            'sink_error': self.sink_error,
+            'retention_removed': getattr(self.sink, 'removed_records', 0),
+            'overflow': self.overflow,
+            'capacity': self.capacity,
+            'queue_size': queue_size,
+            'flush_lag_seconds': round(now - oldest, 3) if oldest is not None else 0.0,
+            'seconds_since_last_flush': (
+                round(now - self.last_flush_time, 3) if self.last_flush_time is not None else None
+            ),
+            'last_flush_duration_ms': round(self.last_flush_duration * 1000, 3),
+            **stats
+        }
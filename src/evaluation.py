@@ -0,0 +1,276 @@
+"""
+Evaluation Module
+-----------------
+This module computes threshold-dependent metrics from a single sort of the
+predicted probabilities:
+- A full threshold sweep with precision, recall, F1 and expected cost at
+  every distinct cut, from cumulative sums of the sorted labels
+- Bootstrap confidence intervals for accuracy, precision, recall, F1 and
+  ROC-AUC, with every replicate expressed as a row of resampling weights
+  so blocks of replicates are evaluated together as matrix operations
+"""
+
+import numpy as np
+import json
+import os
+
+
+# Bootstrap replicates evaluated together; bounds memory to a few
+# (BOOTSTRAP_BLOCK_SIZE x n_samples) matrices
+BOOTSTRAP_BLOCK_SIZE = 50
+
+
+def _safe_divide(numerator, denominator):
+    """
+    Elementwise division returning 0 where the denominator is 0.
+    """
+    numerator = np.asarray(numerator, dtype=np.float64)
+    denominator = np.asarray(denominator, dtype=np.float64)
+    return np.divide(numerator, denominator,
+                     out=np.zeros(np.broadcast(numerator, denominator).shape),
+                     where=denominator != 0)
+
+
+def threshold_sweep(y_true, y_score, cost_fp=1.0, cost_fn=5.0, order=None):
+    """
+    Confusion counts and metrics at every distinct probability cut.
+
+    A customer is flagged as churning when its score is greater than the
+    threshold, as in serving and bootstrap_metrics. Each threshold is the
+    next lower distinct score, so copying it into the scorer reproduces the
+    reported counts. The first entry is the highest score, which flags
+    nobody (no retention campaign), and the last is just below the lowest
+    score, which flags everyone.
+
+    Parameters:
+    -----------
+    y_true : array-like
+        True binary labels
+    y_score : array-like
+        Predicted churn probabilities
+    cost_fp : float
+        Cost of flagging a customer who would have stayed
+    cost_fn : float
+        Cost of missing a customer who churns
+    order : np.ndarray
+        Indices that sort y_score in ascending order, if already computed
+
+    Returns:
+    --------
+    dict
+        Arrays (one entry per threshold, highest threshold first) of
+        thresholds, tp, fp, fn, tn, precision, recall, f1 and expected
+        cost per customer
+    """
+    y_true = np.asarray(y_true).astype(np.int64)
+    y_score = np.asarray(y_score, dtype=np.float64)
+
+    if order is None:
+        order = np.argsort(y_score, kind='mergesort')
+    order = order[::-1]
+    scores = y_score[order]
+    labels = y_true[order]
+
+    # Last index of each run of tied scores: cutting there flags every
+    # customer whose score is above the next run's score. The leading -1
+    # is the cut above the highest score, where nobody is flagged
+    cut = np.r_[-1, np.flatnonzero(np.diff(scores)), len(scores) - 1]
+
+    tp = np.r_[0, np.cumsum(labels)][cut + 1]
+    fp = (cut + 1) - tp
+    n_pos = int(labels.sum())
+    n_neg = len(labels) - n_pos
+    fn = n_pos - tp
+    tn = n_neg - fp
+
+    precision = _safe_divide(tp, tp + fp)
+    recall = _safe_divide(tp, n_pos)
+    f1 = _safe_divide(2 * precision * recall, precision + recall)
+    expected_cost = (cost_fp * fp + cost_fn * fn) / len(labels)
+
+    thresholds = np.r_[scores[cut[:-1] + 1], np.nextafter(scores[-1], -np.inf)]
+
+    return {
+        'thresholds': thresholds,
+        'tp': tp,
+        'fp': fp,
+        'fn': fn,
+        'tn': tn,
+        'precision': precision,
+        'recall': recall,
+        'f1': f1,
+        'expected_cost': expected_cost
+    }
+
+
+def _weighted_metrics(weights, labels, scores, threshold):
+    """
+    Metrics for every row of a resampling weight matrix.
+
+    Parameters:
+    -----------
+    weights : np.ndarray
+        (n_replicates, n_samples) weights aligned with the sorted samples
+    labels : np.ndarray
+        Labels sorted by ascending score
+    scores : np.ndarray
+        Scores sorted ascending
+    threshold : float
+        Customers with a score above the threshold are flagged
+
+    Returns:
+    --------
+    dict
+        Arrays of accuracy, precision, recall, f1 and roc_auc per replicate
+    """
+    pos_weights = weights * labels
+    neg_weights = weights - pos_weights
+
+    # Confusion counts at the decision threshold
+    k = np.searchsorted(scores, threshold, side='right')
+    tp = pos_weights[:, k:].sum(axis=1)
+    fp = neg_weights[:, k:].sum(axis=1)
+    total_pos = pos_weights.sum(axis=1)
+    total_neg = neg_weights.sum(axis=1)
+    fn = total_pos - tp
+    tn = total_neg - fp
+
+    precision = _safe_divide(tp, tp + fp)
+    recall = _safe_divide(tp, total_pos)
+
+    # ROC-AUC as the Mann-Whitney statistic with ties counted as half
+    starts = np.r_[0, np.flatnonzero(np.diff(scores)) + 1]
+    group_pos = np.add.reduceat(pos_weights, starts, axis=1)
+    group_neg = np.add.reduceat(neg_weights, starts, axis=1)
+    neg_below = np.cumsum(group_neg, axis=1) - group_neg
+    auc_numerator = (group_pos * (neg_below + 0.5 * group_neg)).sum(axis=1)
+
+    return {
+        'accuracy': _safe_divide(tp + tn, total_pos + total_neg),
+        'precision': precision,
+        'recall': recall,
+        'f1': _safe_divide(2 * precision * recall, precision + recall),
+        'roc_auc': _safe_divide(auc_numerator, total_pos * total_neg)
+    }
+
+
+def bootstrap_metrics(y_true, y_score, threshold=0.5, n_bootstrap=1000,
+                      confidence=0.95, random_state=42, order=None):
+    """
+    Point estimates and bootstrap confidence intervals of test metrics.
+
+    Parameters:
+    -----------
+    y_true : array-like
+        True binary labels
+    y_score : array-like
+        Predicted churn probabilities
+    threshold : float
+        Customers with a score above the threshold are flagged
+    n_bootstrap : int
+        Number of bootstrap replicates
+    confidence : float
+        Confidence level of the intervals
+    random_state : int
+        Random seed for reproducibility
+    order : np.ndarray
+        Indices that sort y_score in ascending order, if already computed
+
+    Returns:
+    --------
+    dict
+        For each metric: point estimate and lower/upper interval bounds
+    """
+    y_true = np.asarray(y_true).astype(np.float64)
+    y_score = np.asarray(y_score, dtype=np.float64)
+    n = len(y_true)
+
+    if order is None:
+        order = np.argsort(y_score, kind='mergesort')
+    scores = y_score[order]
+    labels = y_true[order]
+
+    # Each replicate's resample is represented by how often it draws each
+    # sample; since samples are exchangeable the draws can be generated
+    # directly in sorted order. Replicates are drawn and evaluated in
+    # blocks so memory does not grow with n_bootstrap
+    rng = np.random.default_rng(random_state)
+    blocks = []
+    for start in range(0, n_bootstrap, BOOTSTRAP_BLOCK_SIZE):
+        size = min(BOOTSTRAP_BLOCK_SIZE, n_bootstrap - start)
+        weights = rng.multinomial(n, np.full(n, 1.0 / n), size=size).astype(np.float64)
+        blocks.append(_weighted_metrics(weights, labels, scores, threshold))
+
+    point = _weighted_metrics(np.ones((1, n)), labels, scores, threshold)
+    replicates = {name: np.concatenate([block[name] for block in blocks])
+                  for name in point}
+
+    alpha = (1 - confidence) / 2
+    result = {}
+    for name, values in replicates.items():
+        lower, upper = np.quantile(values, [alpha, 1 - alpha])
+        result[name] = {
+            'estimate': float(point[name][0]),
+            'lower': float(lower),
+            'upper': float(upper)
+        }
+    return result
+
+
+def _operating_point(sweep, index):
+    """
+    One entry of a threshold sweep, keyed by singular metric names.
+    """
+    point = {key: float(values[index]) for key, values in sweep.items() if key != 'thresholds'}
+    return {'threshold': float(sweep['thresholds'][index]), **point}
+
+
+def build_evaluation_report(y_true, y_score, threshold=0.5, n_bootstrap=1000,
+                            confidence=0.95, cost_fp=1.0, cost_fn=5.0, random_state=42):
+    """
+    Bootstrap intervals, threshold sweep and recommended operating points.
+
+    The probabilities are sorted once and the order is shared by the
+    bootstrap and the sweep.
+
+    Returns:
+    --------
+    dict
+        JSON-serializable evaluation report
+    """
+    y_score = np.asarray(y_score, dtype=np.float64)
+    order = np.argsort(y_score, kind='mergesort')
+    intervals = bootstrap_metrics(y_true, y_score, threshold, n_bootstrap,
+                                  confidence, random_state, order=order)
+    sweep = threshold_sweep(y_true, y_score, cost_fp, cost_fn, order=order)
+
+    best_cost = int(np.argmin(sweep['expected_cost']))
+    best_f1 = int(np.argmax(sweep['f1']))
+
+    return {
+        'decision_threshold': threshold,
+        'n_bootstrap': n_bootstrap,
+        'confidence': confidence,
+        'confidence_intervals': intervals,
+        'costs': {'false_positive': cost_fp, 'false_negative': cost_fn},
+        'min_cost_threshold': _operating_point(sweep, best_cost),
+        'max_f1_threshold': _operating_point(sweep, best_f1),
+        'threshold_sweep': {key: values.tolist() for key, values in sweep.items()}
+    }
+
+
+def save_evaluation_report(report, filepath='models/evaluation_report.json'):
+    """
+    Save an evaluation report as JSON.
+
+    Parameters:
+    -----------
+    report : dict
+        Evaluation report
+    filepath : str
+        Path to save the report
+    """
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    with open(filepath, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"✓ Evaluation report saved to {filepath}")
@@ -0,0 +1,353 @@
+"""
+Inference Module
+----------------
+This module provides a lightweight scoring engine built on the saved
+model artifacts (model, scaler and feature names).
+
+For logistic regression models the scaler and the model coefficients are
+fused into a single coefficient vector, so scoring a batch is one
+matrix-vector product followed by a sigmoid. The fused path can optionally
+run in float32, which halves memory traffic, after checking that it
+reproduces the float64 probabilities on a reference sample.
+"""
+
+import numpy as np
+from scipy.special import expit
+import joblib
+import os
+
+
+# Inputs at least this large use the in-place tanh form of the sigmoid
+SIGMOID_INPLACE_MIN_SIZE = 4096
+
+
+def sigmoid(z):
+    """
+    Logistic function preserving the input dtype.
+
+    Small inputs use scipy's expit, which has the lowest per-call overhead.
+    Large inputs use the identity sigmoid(z) = 0.5 * tanh(z / 2) + 0.5
+    computed in place, which vectorizes better and cannot overflow.
+
+    Parameters:
+    -----------
+    z : np.ndarray
+        Logits
+
+    Returns:
+    --------
+    np.ndarray
+        Probabilities with the same dtype as z
+    """
+    if z.size < SIGMOID_INPLACE_MIN_SIZE:
+        return expit(z)
+    return _sigmoid_tanh(z)
+
+
+def _sigmoid_tanh(z):
+    """
+    Logistic function via 0.5 * tanh(z / 2) + 0.5, used for large inputs.
+    """
+    half = z.dtype.type(0.5)
+    out = z * half
+    np.tanh(out, out=out)
+    out *= half
+    out += half
+    return out
+
+
+def load_artifacts(model_path='models/churn_model.pkl',
+                   scaler_path='models/scaler.pkl',
+                   feature_names_path='models/feature_names.pkl'):
+    """
+    Load the saved model data, scaler and feature names.
+
+    Parameters:
+    -----------
+    model_path : str
+        Path to the saved model data
+    scaler_path : str
+        Path to the saved scaler
+    feature_names_path : str
+        Path to the saved feature names
+
+    Returns:
+    --------
+    tuple
+        (model_data, scaler, feature_names)
+    """
+    for path in (model_path, scaler_path, feature_names_path):
+        if not os.path.exists(path):
+            raise FileNotFoundError(
+                f"Artifact not found at {path}. Please run 'python train.py' first."
+            )
+
+    model_data = joblib.load(model_path)
+    scaler = joblib.load(scaler_path)
+    feature_names = joblib.load(feature_names_path)
+    return model_data, scaler, feature_names
+
+
+def fuse_linear_model(model, scaler):
+    """
+    Fold a StandardScaler into the coefficients of a binary linear model.
+
+    Parameters:
+    -----------
+    model : estimator
+        Fitted binary linear classifier exposing coef_ and intercept_
+    scaler : StandardScaler
+        Fitted scaler applied before the model
+
+    Returns:
+    --------
+    tuple or None
+        (coef, intercept) operating on raw features, or None if the
+        model is not a binary linear model
+    """
+    coef = getattr(model, 'coef_', None)
+    intercept = getattr(model, 'intercept_', None)
+    if coef is None or intercept is None or coef.shape[0] != 1:
+        return None
+
+    coef = np.asarray(coef[0], dtype=np.float64)
+    n_features = getattr(scaler, 'n_features_in_', coef.shape[0])
+    if coef.shape[0] != n_features:
+        return None
+
+    mean = getattr(scaler, 'mean_', None)
+    scale = getattr(scaler, 'scale_', None)
+    mean = np.zeros_like(coef) if mean is None else np.asarray(mean, dtype=np.float64)
+    scale = np.ones_like(coef) if scale is None else np.asarray(scale, dtype=np.float64)
+
+    fused_coef = coef / scale
+    fused_intercept = float(intercept[0]) - float(np.dot(fused_coef, mean))
+    return fused_coef, fused_intercept
+
+
+def reference_sample(feature_names, scaler, profile=None, n_samples=SIGMOID_INPLACE_MIN_SIZE,
+                     random_state=0):
+    """
+    Generate synthetic raw feature rows for checking scoring accuracy.
+
+    Rows are drawn uniformly between each feature's minimum and maximum
+    from the data profile, or within three standard deviations of the
+    scaler's mean when no profile is available.
+
+    Parameters:
+    -----------
+    feature_names : list
+        Feature names in model order
+    scaler : StandardScaler
+        Fitted scaler
+    profile : dict
+        Data profile saved by the preprocessing pipeline
+    n_samples : int
+        Number of rows to generate
+    random_state : int
+        Random seed for reproducibility
+
+    Returns:
+    --------
+    np.ndarray
+        Float64 feature matrix
+    """
+    rng = np.random.default_rng(random_state)
+    if profile is not None and all(name in profile['columns'] for name in feature_names):
+        low = np.array([profile['columns'][name]['min'] for name in feature_names])
+        high = np.array([profile['columns'][name]['max'] for name in feature_names])
+    else:
+        low = scaler.mean_ - 3 * scaler.scale_
+        high = scaler.mean_ + 3 * scaler.scale_
+    return rng.uniform(low, high, size=(n_samples, len(feature_names)))
+
+
+class ChurnScorer:
+    """
+    A class to score raw customer records with the saved artifacts.
+    """
+
+    def __init__(self, model, scaler, feature_names, threshold=0.5, model_version='N/A'):
+        """
+        Initialize the scorer.
+
+        Parameters:
+        -----------
+        model : estimator
+            Fitted classifier
+        scaler : StandardScaler
+            Fitted scaler
+        feature_names : list
+            Feature names in the order expected by the model
+        threshold : float
+            Probability cut-off for the churn label
+        model_version : str
+            Version recorded with audited predictions
+        """
+        self.model = model
+        self.scaler = scaler
+        self.feature_names = list(feature_names)
+        self.threshold = threshold
+        self.model_version = model_version
+        self.dtype = np.float64
+
+        fused = fuse_linear_model(model, scaler)
+        if fused is not None:
+            self.coef, self.intercept = fused
+        else:
+            self.coef, self.intercept = None, None
+
+    @classmethod
+    def from_artifacts(cls, model_path='models/churn_model.pkl',
+                       scaler_path='models/scaler.pkl',
+                       feature_names_path='models/feature_names.pkl'):
+        """
+        Build a scorer from the artifacts saved by train.py.
+
+        Returns:
+        --------
+        ChurnScorer
+            Scorer ready for use
+        """
+        model_data, scaler, feature_names = load_artifacts(
+            model_path, scaler_path, feature_names_path
+        )
+        return cls(model_data['model'], scaler, feature_names,
+                   model_version=model_data.get('timestamp', 'N/A'))
+
+    @property
+    def is_fused(self):
+        """Whether scoring uses the fused linear fast path."""
+        return self.coef is not None
+
+    def enable_reduced_precision(self, reference_X, tolerance=1e-4):
+        """
+        Switch scoring to float32 if it matches float64 within tolerance.
+
+        The float32 probabilities are computed with both sigmoid kernels
+        (expit for small batches, the tanh form for large ones), so the
+        check covers every batch size regardless of the sample size.
+
+        Parameters:
+        -----------
+        reference_X : np.ndarray
+            Raw feature rows used for the comparison
+        tolerance : float
+            Maximum allowed absolute difference in churn probability
+
+        Returns:
+        --------
+        tuple
+            (enabled, max_abs_diff); max_abs_diff is None if the model
+            has no fused linear path (sklearn would upcast to float64)
+        """
+        if not self.is_fused:
+            return False, None
+
+        reference_X = np.asarray(reference_X, dtype=np.float64)
+        proba64 = sigmoid(reference_X @ self.coef + self.intercept)
+
+        coef32 = self.coef.astype(np.float32)
+        intercept32 = np.float32(self.intercept)
+        logits32 = reference_X.astype(np.float32) @ coef32 + intercept32
+
+        max_abs_diff = max(
+            float(np.max(np.abs(proba32.astype(np.float64) - proba64)))
+            for proba32 in (expit(logits32), _sigmoid_tanh(logits32))
+        )
+        if max_abs_diff > tolerance:
+            return False, max_abs_diff
+
+        self.coef, self.intercept = coef32, intercept32
+        self.dtype = np.float32
+        return True, max_abs_diff
+
+    def records_to_matrix(self, records):
+        """
+        Convert a list of feature dictionaries into a feature matrix.
+
+        Parameters:
+        -----------
+        records : list of dict
+            Raw customer records
+
+        Returns:
+        --------
+        tuple
+            (X, errors) where X holds one row per valid record and errors
+            maps the index of each invalid record to an error message
+        """
+        X = np.empty((len(records), len(self.feature_names)), dtype=self.dtype)
+        valid = np.ones(len(records), dtype=bool)
+        errors = {}
+
+        for i, record in enumerate(records):
+            if not isinstance(record, dict):
+                errors[i] = 'Record must be a JSON object'
+                valid[i] = False
+                continue
+
+            missing = [name for name in self.feature_names if name not in record]
+            if missing:
+                errors[i] = f'Missing required features: {", ".join(missing)}'
+                valid[i] = False
+                continue
+
+            for j, name in enumerate(self.feature_names):
+                try:
+                    with np.errstate(over='ignore'):
+                        X[i, j] = float(record[name])
+                except (ValueError, TypeError, OverflowError):
+                    errors[i] = f'Invalid value for feature: {name}'
+                    valid[i] = False
+                    break
+
+            # nan and inf parse as floats (and large values overflow float32)
+            if valid[i] and not np.isfinite(X[i]).all():
+                name = self.feature_names[int(np.argmin(np.isfinite(X[i])))]
+                errors[i] = f'Invalid value for feature: {name}'
+                valid[i] = False
+
+        return X[valid], errors
+
+    def predict_proba(self, X):
+        """
+        Compute churn probabilities for raw (unscaled) features.
+
+        Parameters:
+        -----------
+        X : np.ndarray
+            Raw feature matrix
+
+        Returns:
+        --------
+        np.ndarray
+            Probability of churn for each row
+        """
+        if len(X) == 0:
+            return np.empty(0, dtype=self.dtype)
+
+        if self.is_fused:
+            logits = X @ self.coef
+            logits += self.intercept
+            return sigmoid(logits)
+
+        return self.model.predict_proba(self.scaler.transform(X))[:, 1]
+
+    def predict(self, X):
+        """
+        Compute churn labels and probabilities for raw features.
+
+        Parameters:
+        -----------
+        X : np.ndarray
+            Raw feature matrix
+
+        Returns:
+        --------
+        tuple
+            (predictions, churn_probabilities)
+        """
+        probabilities = self.predict_proba(X)
+        predictions = (probabilities > self.threshold).astype(int)
+        return predictions, probabilities
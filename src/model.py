@@ -19,10 +19,13 @@ import joblib
 import os
 from datetime import datetime
 
+from model_search import ModelSearch
+from evaluation import build_evaluation_report, save_evaluation_report
+
 
 class ChurnPredictor:
     """
-    A class to handle logistic regression model training and evaluation.
+    A class to handle model training and evaluation.
     """
     
     def __init__(self, random_state=42):
@@ -38,6 +41,9 @@ class ChurnPredictor:
         self.model = None
         self.best_params = None
         self.feature_importance = None
+        self.model_type = None
+        self.model_search = None
+        self.evaluation_report = None
         
     def train_model(self, X_train, y_train, hyperparameter_tuning=True):
         """
@@ -106,12 +112,63 @@ class ChurnPredictor:
             self.model.fit(X_train, y_train)
             print("✓ Model trained successfully!")
         
+        self.model_type = 'Logistic Regression'
+        return self.model
+    
+    def search_models(self, X_train, y_train, X_test, y_test,
+                      time_budget=300, latency_slo_ms=5.0, scaler=None):
+        """
+        Evaluate several model families and keep the best one that meets
+        the serving latency SLO.
+        
+        Parameters:
+        -----------
+        X_train : np.ndarray
+            Training features
+        y_train : np.ndarray or pd.Series
+            Training target
+        X_test : np.ndarray
+            Test features, used for latency measurements
+        y_test : np.ndarray or pd.Series
+            Test target
+        time_budget : float
+            Wall-clock seconds allowed for tuning all candidates
+        latency_slo_ms : float
+            Maximum single-row p99 inference latency in milliseconds
+        scaler : StandardScaler
+            Fitted scaler, so latency is measured on the serving path
+            
+        Returns:
+        --------
+        estimator
+            Selected model
+        """
+        print("\n" + "="*80)
+        print("MODEL FAMILY SEARCH")
+        print("="*80)
+        
+        search = ModelSearch(
+            time_budget=time_budget,
+            latency_slo_ms=latency_slo_ms,
+            random_state=self.random_state
+        )
+        selected = search.run(X_train, y_train, X_test, y_test, scaler=scaler)
+        
+        self.model = selected['model']
+        self.best_params = selected['best_params']
+        self.model_type = selected['model_type']
+        self.model_search = search.trade_off_table()
+        
         return self.model
     
-    def evaluate_model(self, X_test, y_test, feature_names=None):
+    def evaluate_model(self, X_test, y_test, feature_names=None,
+                       n_bootstrap=1000, cost_fp=1.0, cost_fn=5.0):
         """
         Evaluate model performance on test data.
         
+        Also computes bootstrap confidence intervals and a full threshold
+        sweep from a single sort of the predicted probabilities.
+        
         Parameters:
         -----------
         X_test : np.ndarray
@@ -120,6 +177,12 @@ class ChurnPredictor:
             Test target
         feature_names : list
             Names of features for feature importance
+        n_bootstrap : int
+            Number of bootstrap replicates for confidence intervals
+        cost_fp : float
+            Cost of targeting a customer who would not have churned
+        cost_fn : float
+            Cost of missing a customer who churns
             
         Returns:
         --------
@@ -144,13 +207,32 @@ class ChurnPredictor:
             'confusion_matrix': confusion_matrix(y_test, y_pred)
         }
         
+        # Bootstrap confidence intervals and threshold sweep
+        self.evaluation_report = build_evaluation_report(
+            y_test, y_pred_proba,
+            n_bootstrap=n_bootstrap,
+            cost_fp=cost_fp,
+            cost_fn=cost_fn,
+            random_state=self.random_state
+        )
+        intervals = self.evaluation_report['confidence_intervals']
+        metrics['confidence_intervals'] = intervals
+        
         # Print metrics
-        print("\nPerformance Metrics:")
-        print(f"  Accuracy:  {metrics['accuracy']:.4f}")
-        print(f"  Precision: {metrics['precision']:.4f}")
-        print(f"  Recall:    {metrics['recall']:.4f}")
-        print(f"  F1-Score:  {metrics['f1_score']:.4f}")
-        print(f"  ROC-AUC:   {metrics['roc_auc']:.4f}")
+        print(f"\nPerformance Metrics (95% bootstrap CI, {n_bootstrap} replicates):")
+        for label, key, ci_key in [('Accuracy:  ', 'accuracy', 'accuracy'),
+                                   ('Precision: ', 'precision', 'precision'),
+                                   ('Recall:    ', 'recall', 'recall'),
+                                   ('F1-Score:  ', 'f1_score', 'f1'),
+                                   ('ROC-AUC:   ', 'roc_auc', 'roc_auc')]:
+            print(f"  {label}{metrics[key]:.4f}  "
+                  f"[{intervals[ci_key]['lower']:.4f}, {intervals[ci_key]['upper']:.4f}]")
+        
+        best = self.evaluation_report['min_cost_threshold']
+        print(f"\nMinimum expected-cost threshold (FP cost {cost_fp}, FN cost {cost_fn}): "
+              f"{best['threshold']:.4f}")
+        print(f"  Precision: {best['precision']:.4f}, Recall: {best['recall']:.4f}, "
+              f"Expected cost per customer: {best['expected_cost']:.4f}")
         
         # Confusion Matrix
         print("\nConfusion Matrix:")
@@ -161,11 +243,12 @@ class ChurnPredictor:
         print(classification_report(y_test, y_pred, 
                                    target_names=['Not Churned', 'Churned']))
         
-        # Feature importance
-        if feature_names is not None:
+        # Feature importance (coefficients of linear models on the raw features)
+        coef = getattr(self.model, 'coef_', None)
+        if feature_names is not None and coef is not None and coef.shape[1] == len(feature_names):
             self.feature_importance = pd.DataFrame({
                 'feature': feature_names,
-                'coefficient': self.model.coef_[0]
+                'coefficient': coef[0]
             }).sort_values(by='coefficient', key=abs, ascending=False)
             
             print("\nTop 5 Most Important Features:")
@@ -243,10 +326,19 @@ class ChurnPredictor:
         -----------
         save_path : str
             Path to save the plot
+            
+        Returns:
+        --------
+        bool
+            Whether the plot was written
         """
         if self.feature_importance is None:
-            print("Feature importance not available. Run evaluate_model first.")
-            return
+            print("Feature importance not available for this model type.")
+            # Do not leave a plot from a previous model next to this one
+            if os.path.exists(save_path):
+                os.remove(save_path)
+                print(f"✓ Removed stale {save_path}")
+            return False
         
         plt.figure(figsize=(10, 8))
         colors = ['red' if x < 0 else 'green' for x in self.feature_importance['coefficient']]
@@ -265,6 +357,21 @@ class ChurnPredictor:
         plt.savefig(save_path, dpi=300, bbox_inches='tight')
         plt.close()
         print(f"✓ Feature importance plot saved to {save_path}")
+        return True
+    
+    def save_evaluation_report(self, filepath='models/evaluation_report.json'):
+        """
+        Save the bootstrap intervals and threshold sweep to disk.
+        
+        Parameters:
+        -----------
+        filepath : str
+            Path to save the report
+        """
+        if self.evaluation_report is None:
+            print("Evaluation report not available. Run evaluate_model first.")
+            return
+        save_evaluation_report(self.evaluation_report, filepath)
     
     def save_model(self, filepath='models/churn_model.pkl'):
         """
@@ -280,8 +387,10 @@ class ChurnPredictor:
         # Save model with metadata
         model_data = {
             'model': self.model,
+            'model_type': self.model_type,
             'best_params': self.best_params,
             'feature_importance': self.feature_importance,
+            'model_search': self.model_search,
             'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         }
         
@@ -301,6 +410,8 @@ class ChurnPredictor:
         self.model = model_data['model']
         self.best_params = model_data.get('best_params')
         self.feature_importance = model_data.get('feature_importance')
+        self.model_type = model_data.get('model_type', 'Logistic Regression')
+        self.model_search = model_data.get('model_search')
         print(f"✓ Model loaded from {filepath}")
         return self.model
     
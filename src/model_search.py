@@ -0,0 +1,335 @@
+"""
+Model Search Module
+-------------------
+This module evaluates several model families under a wall-clock budget and
+picks the most accurate one that meets a serving latency objective.
+
+Candidates are tuned in parallel worker processes with GridSearchCV.
+Candidates still running when the budget runs out are terminated and
+reported as timed out, and candidates whose fit raises are reported as
+failed. If no candidate completes, a default logistic regression is fitted
+instead. Inference latency is measured afterwards, one model at a time in
+the main process and through the same ChurnScorer path used for serving,
+so the measurements do not compete with training for CPU.
+"""
+
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+from sklearn.ensemble import HistGradientBoostingClassifier
+from sklearn.preprocessing import PolynomialFeatures
+from sklearn.pipeline import Pipeline
+from sklearn.model_selection import GridSearchCV
+from sklearn.metrics import roc_auc_score
+import multiprocessing
+import time
+
+from inference import ChurnScorer
+
+
+def default_candidates(random_state=42):
+    """
+    Model families evaluated by the search.
+
+    Parameters:
+    -----------
+    random_state : int
+        Random seed for reproducibility
+
+    Returns:
+    --------
+    dict
+        Mapping of candidate name to (display name, estimator, param_grid)
+    """
+    return {
+        'logistic_regression': (
+            'Logistic Regression',
+            LogisticRegression(random_state=random_state),
+            {
+                'C': [0.001, 0.01, 0.1, 1, 10, 100],
+                'penalty': ['l1', 'l2'],
+                'solver': ['liblinear', 'saga'],
+                'max_iter': [1000]
+            }
+        ),
+        'logistic_regression_interactions': (
+            'Logistic Regression (pairwise interactions)',
+            Pipeline([
+                ('interactions', PolynomialFeatures(degree=2, interaction_only=True,
+                                                    include_bias=False)),
+                ('model', LogisticRegression(random_state=random_state, max_iter=2000))
+            ]),
+            {
+                'model__C': [0.01, 0.1, 1, 10]
+            }
+        ),
+        'hist_gradient_boosting': (
+            'Histogram Gradient Boosting',
+            HistGradientBoostingClassifier(random_state=random_state),
+            {
+                'learning_rate': [0.05, 0.1],
+                'max_leaf_nodes': [15, 31],
+                'max_iter': [200]
+            }
+        )
+    }
+
+
+def _fit_candidate(name, estimator, param_grid, X_train, y_train, cv):
+    """
+    Tune one candidate. Runs in a worker process.
+    """
+    start = time.perf_counter()
+    grid_search = GridSearchCV(
+        estimator=estimator,
+        param_grid=param_grid,
+        cv=cv,
+        scoring='roc_auc',
+        n_jobs=1
+    )
+    grid_search.fit(X_train, y_train)
+    return {
+        'name': name,
+        'model': grid_search.best_estimator_,
+        'best_params': grid_search.best_params_,
+        'cv_roc_auc': float(grid_search.best_score_),
+        'fit_seconds': time.perf_counter() - start
+    }
+
+
+def measure_latency(model, X, n_single=200, n_batch=5):
+    """
+    Measure single-row latency and batch throughput of predict_proba.
+
+    Parameters:
+    -----------
+    model : ChurnScorer or estimator
+        Scorer (or fitted classifier) whose predict_proba is timed
+    X : np.ndarray
+        Sample features in the form the model expects (rows are reused
+        for single-row calls)
+    n_single : int
+        Number of single-row calls
+    n_batch : int
+        Number of full-batch calls
+
+    Returns:
+    --------
+    dict
+        Single-row p50/p99 latency in milliseconds and batch rows per second
+    """
+    # One untimed call so lazy initialisation is not measured
+    model.predict_proba(X[:1])
+
+    timings = np.empty(n_single)
+    for i in range(n_single):
+        row = X[i % len(X)].reshape(1, -1)
+        start = time.perf_counter()
+        model.predict_proba(row)
+        timings[i] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(n_batch):
+        model.predict_proba(X)
+    batch_seconds = (time.perf_counter() - start) / n_batch
+
+    return {
+        'single_row_p50_ms': float(np.percentile(timings, 50) * 1000),
+        'single_row_p99_ms': float(np.percentile(timings, 99) * 1000),
+        'batch_rows_per_second': float(len(X) / batch_seconds) if batch_seconds > 0 else float('inf')
+    }
+
+
+class ModelSearch:
+    """
+    A class to run a time-budgeted, latency-aware model family search.
+    """
+
+    def __init__(self, time_budget=300, latency_slo_ms=5.0, cv=5,
+                 random_state=42, candidates=None):
+        """
+        Initialize the search.
+
+        Parameters:
+        -----------
+        time_budget : float
+            Wall-clock seconds allowed for tuning all candidates
+        latency_slo_ms : float
+            Maximum single-row p99 latency allowed for the selected model
+        cv : int
+            Number of cross-validation folds
+        random_state : int
+            Random seed for reproducibility
+        candidates : dict
+            Candidate definitions; defaults to default_candidates()
+        """
+        self.time_budget = time_budget
+        self.latency_slo_ms = latency_slo_ms
+        self.cv = cv
+        self.random_state = random_state
+        self.candidates = candidates or default_candidates(random_state)
+        self.results = []
+        self.selected = None
+
+    def _fit_all(self, X_train, y_train):
+        """
+        Tune all candidates in parallel until the time budget runs out.
+        """
+        deadline = time.monotonic() + self.time_budget
+        fitted = {}
+        timed_out = []
+        failed = {}
+
+        pool = multiprocessing.Pool(processes=min(len(self.candidates), multiprocessing.cpu_count()))
+        try:
+            pending = {
+                name: pool.apply_async(
+                    _fit_candidate,
+                    (name, estimator, param_grid, X_train, y_train, self.cv)
+                )
+                for name, (_, estimator, param_grid) in self.candidates.items()
+            }
+            for name, async_result in pending.items():
+                try:
+                    fitted[name] = async_result.get(timeout=max(deadline - time.monotonic(), 0))
+                except multiprocessing.TimeoutError:
+                    timed_out.append(name)
+                except Exception as e:
+                    print(f"⚠ Warning: {name} failed: {str(e)}")
+                    failed[name] = str(e)
+        finally:
+            pool.terminate()
+            pool.join()
+
+        return fitted, timed_out, failed
+
+    def _fallback(self, X_train, y_train):
+        """
+        Fit a default logistic regression when no candidate completed.
+        """
+        start = time.perf_counter()
+        model = LogisticRegression(random_state=self.random_state, max_iter=1000)
+        model.fit(X_train, y_train)
+        return {
+            'name': 'logistic_regression_default',
+            'model': model,
+            'best_params': {},
+            'cv_roc_auc': None,
+            'fit_seconds': time.perf_counter() - start
+        }
+
+    def _measure(self, result, display_name, status, X_test, y_test, scaler):
+        """
+        Add test ROC-AUC and serving latency to a fitted candidate.
+        """
+        model = result['model']
+        if scaler is not None:
+            # Time the serving path: raw rows through ChurnScorer
+            scorer = ChurnScorer(model, scaler, [f'x{i}' for i in range(X_test.shape[1])])
+            latency = measure_latency(scorer, scaler.inverse_transform(X_test))
+        else:
+            latency = measure_latency(model, X_test)
+        result.update({
+            'model_type': display_name,
+            'status': status,
+            'test_roc_auc': float(roc_auc_score(y_test, model.predict_proba(X_test)[:, 1])),
+            **latency
+        })
+        result['meets_slo'] = result['single_row_p99_ms'] <= self.latency_slo_ms
+        return result
+
+    def run(self, X_train, y_train, X_test, y_test, scaler=None):
+        """
+        Tune, measure and select a model.
+
+        Parameters:
+        -----------
+        X_train : np.ndarray
+            Training features
+        y_train : np.ndarray or pd.Series
+            Training target
+        X_test : np.ndarray
+            Test features, used for test ROC-AUC and latency measurements
+        y_test : np.ndarray or pd.Series
+            Test target
+        scaler : StandardScaler
+            Fitted scaler; when given, latency is measured on raw rows
+            through ChurnScorer, as in serving
+
+        Returns:
+        --------
+        dict
+            The selected candidate's result
+        """
+        print(f"\nEvaluating {len(self.candidates)} model families in parallel "
+              f"(time budget: {self.time_budget}s, latency SLO: {self.latency_slo_ms}ms)...")
+
+        fitted, timed_out, failed = self._fit_all(X_train, y_train)
+
+        self.results = []
+        for name, (display_name, _, _) in self.candidates.items():
+            if name in timed_out:
+                self.results.append({'name': name, 'model_type': display_name, 'status': 'timed_out'})
+                continue
+            if name in failed:
+                self.results.append({'name': name, 'model_type': display_name, 'status': 'failed',
+                                     'error': failed[name]})
+                continue
+
+            self.results.append(
+                self._measure(fitted[name], display_name, 'completed', X_test, y_test, scaler)
+            )
+
+        completed = [r for r in self.results if r['status'] == 'completed']
+        if not completed:
+            print("⚠ Warning: No model finished within the time budget; "
+                  "fitting a default logistic regression")
+            fallback = self._measure(self._fallback(X_train, y_train), 'Logistic Regression',
+                                     'fallback', X_test, y_test, scaler)
+            self.results.append(fallback)
+            completed = [fallback]
+
+        eligible = [r for r in completed if r['meets_slo']]
+        if eligible:
+            self.selected = max(eligible, key=lambda r: r['cv_roc_auc'])
+        else:
+            print(f"⚠ Warning: No model meets the {self.latency_slo_ms}ms latency SLO; "
+                  f"selecting the fastest model")
+            self.selected = min(completed, key=lambda r: r['single_row_p99_ms'])
+
+        self.print_table()
+        print(f"\n✓ Selected model: {self.selected['model_type']}")
+        return self.selected
+
+    def trade_off_table(self):
+        """
+        Search results without the fitted estimators.
+
+        Returns:
+        --------
+        dict
+            Budget, SLO, selected candidate and one row per candidate
+        """
+        return {
+            'time_budget_seconds': self.time_budget,
+            'latency_slo_ms': self.latency_slo_ms,
+            'selected': self.selected['name'] if self.selected else None,
+            'candidates': [
+                {key: value for key, value in r.items() if key != 'model'}
+                for r in self.results
+            ]
+        }
+
+    def print_table(self):
+        """
+        Print the accuracy/latency trade-off table.
+        """
+        print(f"\n{'Model':<45} {'CV AUC':>7} {'Test AUC':>8} {'p50 ms':>7} "
+              f"{'p99 ms':>7} {'Rows/s':>10} {'SLO':>4}")
+        for r in self.results:
+            if r['status'] in ('timed_out', 'failed'):
+                print(f"{r['model_type']:<45} {r['status'].replace('_', ' '):>7}")
+                continue
+            cv_auc = f"{r['cv_roc_auc']:.4f}" if r['cv_roc_auc'] is not None else 'n/a'
+            print(f"{r['model_type']:<45} {cv_auc:>7} {r['test_roc_auc']:>8.4f} "
+                  f"{r['single_row_p50_ms']:>7.3f} {r['single_row_p99_ms']:>7.3f} "
+                  f"{r['batch_rows_per_second']:>10,.0f} {'yes' if r['meets_slo'] else 'no':>4}")
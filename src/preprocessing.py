@@ -3,6 +3,7 @@ Data Preprocessing Module
 --------------------------
 This module handles all data preprocessing tasks including:
 - Data loading
+- Single-pass data profiling
 - Missing value handling
 - Feature encoding
 - Feature scaling
@@ -16,6 +17,8 @@ from sklearn.preprocessing import StandardScaler
 import joblib
 import os
 
+from profiling import DataProfiler, save_profile
+
 
 class DataPreprocessor:
     """
@@ -35,6 +38,7 @@ class DataPreprocessor:
         self.scaler = StandardScaler()
         self.feature_names = None
         self.data = None
+        self.profile = None
         
     def load_data(self):
         """
@@ -50,10 +54,20 @@ class DataPreprocessor:
         print(f"Data loaded successfully! Shape: {self.data.shape}")
         return self.data
     
-    def check_data_quality(self):
+    def check_data_quality(self, target='Churn', chunksize=100000):
         """
         Check for missing values and duplicates.
         
+        Builds the data profile (missing values, duplicates, column
+        statistics, histograms and target balance) in one chunked pass.
+        
+        Parameters:
+        -----------
+        target : str
+            Name of the target column
+        chunksize : int
+            Rows per profiling chunk
+        
         Returns:
         --------
         dict
@@ -63,11 +77,13 @@ class DataPreprocessor:
         print("DATA QUALITY CHECK")
         print("="*80)
         
+        self.profile = DataProfiler(target=target).profile_frame(self.data, chunksize)
+        
         quality_metrics = {
-            'missing_values': self.data.isnull().sum().sum(),
-            'duplicates': self.data.duplicated().sum(),
-            'total_rows': len(self.data),
-            'total_columns': len(self.data.columns)
+            'missing_values': self.profile['missing_values'],
+            'duplicates': self.profile['duplicates'],
+            'total_rows': self.profile['n_rows'],
+            'total_columns': self.profile['n_columns']
         }
         
         print(f"Total Rows: {quality_metrics['total_rows']}")
@@ -105,9 +121,12 @@ class DataPreprocessor:
         print(f"Target shape: {y.shape}")
         print(f"Feature names: {self.feature_names}")
         
-        # Check target distribution
-        churn_dist = y.value_counts()
-        churn_pct = y.value_counts(normalize=True) * 100
+        # Check target distribution, reusing the profile when available
+        if self.profile is not None and 'target' in self.profile:
+            churn_dist = {int(float(k)): v for k, v in self.profile['target']['counts'].items()}
+        else:
+            churn_dist = y.value_counts().to_dict()
+        churn_pct = {k: v / len(y) * 100 for k, v in churn_dist.items()}
         print(f"\nTarget Distribution:")
         print(f"  Not Churned (0): {churn_dist[0]} ({churn_pct[0]:.2f}%)")
         print(f"  Churned (1): {churn_dist[1]} ({churn_pct[1]:.2f}%)")
@@ -205,6 +224,20 @@ class DataPreprocessor:
         joblib.dump(self.feature_names, filepath)
         print(f"✓ Feature names saved to {filepath}")
     
+    def save_profile(self, filepath='models/data_profile.json'):
+        """
+        Save the data profile to disk.
+        
+        Parameters:
+        -----------
+        filepath : str
+            Path to save the profile
+        """
+        if self.profile is None:
+            print("Data profile not available. Run check_data_quality first.")
+            return
+        save_profile(self.profile, filepath)
+    
     def preprocess_pipeline(self, test_size=0.2, random_state=42):
         """
         Complete preprocessing pipeline.
@@ -240,9 +273,10 @@ class DataPreprocessor:
         # Scale features
         X_train_scaled, X_test_scaled = self.scale_features(X_train, X_test)
         
-        # Save scaler and feature names
+        # Save scaler, feature names and data profile
         self.save_scaler()
         self.save_feature_names()
+        self.save_profile()
         
         print("\n" + "="*80)
         print("✓ PREPROCESSING PIPELINE COMPLETED SUCCESSFULLY!")
@@ -251,6 +285,8 @@ class DataPreprocessor:
         return {
             'X_train': X_train_scaled,
             'X_test': X_test_scaled,
+            'X_train_raw': X_train,
+            'X_test_raw': X_test,
             'y_train': y_train,
             'y_test': y_test,
             'feature_names': self.feature_names,
@@ -0,0 +1,350 @@
+"""
+Data Profiling Module
+---------------------
+This module computes a data profile in a single chunked pass:
+- Missing value counts
+- Duplicate rows (via 64-bit row hashes)
+- Per-column count, min, max, mean and variance
+- Per-column histograms
+- Target class balance
+
+Chunks are merged incrementally, so CSV files larger than memory can be
+profiled by streaming them with pandas' chunked reader. The resulting
+profile is saved as JSON next to the model artifacts for reuse at serving
+time (input validation, drift checks).
+"""
+
+import pandas as pd
+import numpy as np
+import json
+import os
+
+
+class StreamingHistogram:
+    """
+    A fixed-size histogram whose range grows as new values arrive.
+
+    Values are counted on an internal grid oversample times finer than the
+    output. The grid starts at the span of the first chunk and stays
+    anchored to the observed minimum: when a value falls outside it,
+    adjacent bins are merged in pairs until the observed span fits, and
+    the grid is shifted so its first bin holds the minimum. to_dict()
+    rebins the fine grid onto n_bins equal bins between the observed
+    minimum and maximum, so no output bin covers values that never
+    occurred.
+    """
+
+    def __init__(self, n_bins=32, oversample=8):
+        """
+        Initialize an empty histogram.
+
+        Parameters:
+        -----------
+        n_bins : int
+            Number of output bins
+        oversample : int
+            Internal bins per output bin (the internal count must be even)
+        """
+        self.n_bins = n_bins
+        self.n_fine = n_bins * oversample
+        self.counts = np.zeros(self.n_fine, dtype=np.int64)
+        self.lo = None
+        self.width = None
+        self.min = None
+        self.max = None
+
+    def _merge_pairs(self):
+        merged = self.counts.reshape(-1, 2).sum(axis=1)
+        self.counts = np.concatenate([merged, np.zeros_like(merged)])
+        self.width *= 2
+
+    def _shift(self, offset):
+        if offset > 0:
+            self.counts = np.concatenate([self.counts[offset:], np.zeros(offset, dtype=np.int64)])
+        elif offset < 0:
+            self.counts = np.concatenate([np.zeros(-offset, dtype=np.int64), self.counts[:offset]])
+        self.lo += offset * self.width
+
+    def update(self, values):
+        """
+        Add finite values to the histogram.
+
+        Parameters:
+        -----------
+        values : np.ndarray
+            Values without NaNs
+        """
+        if len(values) == 0:
+            return
+
+        vmin, vmax = float(values.min()), float(values.max())
+        if self.lo is None:
+            self.lo, self.min, self.max = vmin, vmin, vmax
+            self.width = (vmax - vmin) / self.n_fine if vmax > vmin else 1.0
+        self.min = min(self.min, vmin)
+        self.max = max(self.max, vmax)
+
+        # Widen the bins until the observed span fits, then move the grid
+        # so that its first bin contains the observed minimum
+        while True:
+            offset = int(np.floor((self.min - self.lo) / self.width))
+            if self.max <= self.lo + (offset + self.n_fine) * self.width:
+                break
+            self._merge_pairs()
+        self._shift(offset)
+
+        idx = ((values - self.lo) / self.width).astype(np.int64)
+        np.clip(idx, 0, self.n_fine - 1, out=idx)
+        self.counts += np.bincount(idx, minlength=self.n_fine)
+
+    def to_dict(self):
+        """
+        Histogram as JSON-serializable bin edges and counts, with n_bins
+        equal bins from the observed minimum to the observed maximum.
+        Counts within a fine bin are assumed to be spread uniformly.
+        """
+        if self.lo is None:
+            return {'bin_edges': [], 'counts': []}
+
+        total = int(self.counts.sum())
+        if self.max == self.min:
+            edges = np.linspace(self.min - 0.5, self.max + 0.5, self.n_bins + 1)
+            counts = np.zeros(self.n_bins, dtype=np.int64)
+            counts[self.n_bins // 2] = total
+            return {'bin_edges': edges.tolist(), 'counts': counts.tolist()}
+
+        fine_edges = self.lo + self.width * np.arange(self.n_fine + 1)
+        cumulative = np.concatenate([[0], np.cumsum(self.counts)]).astype(np.float64)
+        edges = np.linspace(self.min, self.max, self.n_bins + 1)
+        at_edges = np.round(np.interp(edges, fine_edges, cumulative))
+        at_edges[0], at_edges[-1] = 0, total
+        counts = np.diff(at_edges).astype(np.int64)
+        return {'bin_edges': edges.tolist(), 'counts': counts.tolist()}
+
+
+class DataProfiler:
+    """
+    A class to build a data profile from one pass over chunks of data.
+    """
+
+    def __init__(self, target=None, n_bins=32):
+        """
+        Initialize the profiler.
+
+        Parameters:
+        -----------
+        target : str
+            Name of the target column, if any
+        n_bins : int
+            Number of histogram bins per numeric column
+        """
+        self.target = target
+        self.n_bins = n_bins
+        self.columns = None
+        self.numeric_columns = None
+        self.n_rows = 0
+        self.missing = None
+        self.count = None
+        self.mean = None
+        self.m2 = None
+        self.min = None
+        self.max = None
+        self.histograms = None
+        self.target_counts = {}
+        self._row_hashes = []
+
+    def _initialize(self, chunk):
+        self.columns = chunk.columns.tolist()
+        self.numeric_columns = chunk.select_dtypes(include='number').columns.tolist()
+        n_numeric = len(self.numeric_columns)
+        self.missing = np.zeros(len(self.columns), dtype=np.int64)
+        self.count = np.zeros(n_numeric, dtype=np.int64)
+        self.mean = np.zeros(n_numeric)
+        self.m2 = np.zeros(n_numeric)
+        self.min = np.full(n_numeric, np.inf)
+        self.max = np.full(n_numeric, -np.inf)
+        self.histograms = [StreamingHistogram(self.n_bins) for _ in self.numeric_columns]
+
+    def update(self, chunk):
+        """
+        Merge one chunk of rows into the profile.
+
+        Parameters:
+        -----------
+        chunk : pd.DataFrame
+            Next block of rows; all chunks must share the same columns
+        """
+        if self.columns is None:
+            self._initialize(chunk)
+        if len(chunk) == 0:
+            return
+
+        self.n_rows += len(chunk)
+        self.missing += chunk.isna().to_numpy().sum(axis=0)
+
+        # Hash rows with numeric columns as float64 so identical rows hash the
+        # same even if the CSV reader infers different dtypes per chunk
+        hashable = chunk.astype({col: np.float64 for col in self.numeric_columns})
+        self._row_hashes.append(pd.util.hash_pandas_object(hashable, index=False).to_numpy())
+
+        values = chunk[self.numeric_columns].to_numpy(dtype=np.float64)
+        observed = ~np.isnan(values)
+        n = observed.sum(axis=0)
+        has_values = n > 0
+        safe_n = np.maximum(n, 1)
+        batch_mean = np.where(observed, values, 0.0).sum(axis=0) / safe_n
+        batch_m2 = np.where(observed, (values - batch_mean) ** 2, 0.0).sum(axis=0)
+
+        # Chan et al. parallel update of mean and sum of squared deviations
+        total = self.count + n
+        safe_total = np.maximum(total, 1)
+        delta = batch_mean - self.mean
+        self.mean = np.where(has_values, self.mean + delta * n / safe_total, self.mean)
+        self.m2 = np.where(has_values, self.m2 + batch_m2 + delta ** 2 * self.count * n / safe_total, self.m2)
+        self.count = total
+
+        self.min = np.fmin(self.min, np.where(observed, values, np.inf).min(axis=0))
+        self.max = np.fmax(self.max, np.where(observed, values, -np.inf).max(axis=0))
+
+        for j, histogram in enumerate(self.histograms):
+            histogram.update(values[observed[:, j], j])
+
+        if self.target is not None and self.target in chunk.columns:
+            for value, count in chunk[self.target].value_counts().items():
+                key = str(value)
+                self.target_counts[key] = self.target_counts.get(key, 0) + int(count)
+
+    def profile(self):
+        """
+        Build the profile from everything seen so far.
+
+        Returns:
+        --------
+        dict
+            JSON-serializable data profile
+        """
+        if self.columns is None:
+            raise ValueError('No data has been profiled yet')
+
+        hashes = np.concatenate(self._row_hashes) if self._row_hashes else np.empty(0, dtype=np.uint64)
+        duplicates = int(len(hashes) - len(np.unique(hashes)))
+
+        columns = {}
+        for i, name in enumerate(self.columns):
+            columns[name] = {'missing': int(self.missing[i])}
+        for j, name in enumerate(self.numeric_columns):
+            n = int(self.count[j])
+            columns[name].update({
+                'count': n,
+                'min': float(self.min[j]) if n else None,
+                'max': float(self.max[j]) if n else None,
+                'mean': float(self.mean[j]) if n else None,
+                'variance': float(self.m2[j] / (n - 1)) if n > 1 else 0.0,
+                'histogram': self.histograms[j].to_dict()
+            })
+
+        profile = {
+            'n_rows': self.n_rows,
+            'n_columns': len(self.columns),
+            'missing_values': int(self.missing.sum()),
+            'duplicates': duplicates,
+            'columns': columns
+        }
+
+        if self.target is not None:
+            total = sum(self.target_counts.values())
+            profile['target'] = {
+                'column': self.target,
+                'counts': dict(sorted(self.target_counts.items())),
+                'proportions': {
+                    key: count / total for key, count in sorted(self.target_counts.items())
+                }
+            }
+
+        return profile
+
+    def profile_frame(self, data, chunksize=100000):
+        """
+        Profile an in-memory dataframe in chunks.
+
+        Parameters:
+        -----------
+        data : pd.DataFrame
+            Data to profile
+        chunksize : int
+            Rows per chunk
+
+        Returns:
+        --------
+        dict
+            Data profile
+        """
+        for start in range(0, max(len(data), 1), chunksize):
+            self.update(data.iloc[start:start + chunksize])
+        return self.profile()
+
+    def profile_csv(self, path, chunksize=100000):
+        """
+        Profile a CSV file by streaming it in chunks.
+
+        Parameters:
+        -----------
+        path : str
+            Path to the CSV file
+        chunksize : int
+            Rows per chunk
+
+        Returns:
+        --------
+        dict
+            Data profile
+        """
+        with pd.read_csv(path, chunksize=chunksize) as reader:
+            for chunk in reader:
+                self.update(chunk)
+        return self.profile()
+
+
+def save_profile(profile, filepath='models/data_profile.json'):
+    """
+    Save a data profile as JSON.
+
+    Parameters:
+    -----------
+    profile : dict
+        Data profile
+    filepath : str
+        Path to save the profile
+    """
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    with open(filepath, 'w') as f:
+        json.dump(profile, f, indent=2)
+    print(f"✓ Data profile saved to {filepath}")
+
+
+def load_profile(filepath='models/data_profile.json'):
+    """
+    Load a data profile saved by save_profile.
+
+    Parameters:
+    -----------
+    filepath : str
+        Path to the profile
+
+    Returns:
+    --------
+    dict or None
+        Data profile, or None if the file does not exist
+    """
+    if not os.path.exists(filepath):
+        return None
+    with open(filepath) as f:
+        return json.load(f)
+
+
+if __name__ == "__main__":
+    # Example usage: stream the dataset without loading it into memory
+    profiler = DataProfiler(target='Churn')
+    data_profile = profiler.profile_csv('../telecom_churn.csv', chunksize=1000)
+    print(f"Rows: {data_profile['n_rows']}, duplicates: {data_profile['duplicates']}")
+    print(f"Target balance: {data_profile['target']['counts']}")
@@ -0,0 +1,440 @@
+"""
+Segmented Model Module
+----------------------
+This module trains one logistic regression per customer segment (by
+default every combination of ContractRenewal and DataPlan) and serves
+them together.
+
+All segment models, plus a global model used for unseen segments, are
+fused with the scaler and stacked into one coefficient matrix. A
+precomputed routing table maps each segment key to its row, so a batch
+that mixes segments is scored with one matrix multiply followed by a
+vectorized gather of each row's own logit.
+"""
+
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import GridSearchCV
+from sklearn.metrics import roc_auc_score, accuracy_score
+from joblib import Parallel, delayed
+import joblib
+import os
+from datetime import datetime
+
+from scipy.special import expit
+
+from inference import ChurnScorer, fuse_linear_model, sigmoid, _sigmoid_tanh
+
+
+SEGMENT_FEATURES = ['ContractRenewal', 'DataPlan']
+GLOBAL_ROW = 0
+
+
+def _fit_logistic_regression(X, y, random_state, cv=5):
+    """
+    Fit a logistic regression, tuning C with cross-validation when the
+    minority class is large enough.
+    """
+    minority = int(min(np.sum(y == 0), np.sum(y == 1)))
+    base_model = LogisticRegression(random_state=random_state, max_iter=1000)
+    if minority < 2:
+        return base_model.fit(X, y)
+
+    grid_search = GridSearchCV(
+        estimator=base_model,
+        param_grid={'C': [0.01, 0.1, 1, 10]},
+        cv=min(cv, minority),
+        scoring='roc_auc',
+        n_jobs=1
+    )
+    grid_search.fit(X, y)
+    return grid_search.best_estimator_
+
+
+class SegmentedChurnModel:
+    """
+    A class to train, evaluate and score per-segment logistic regressions.
+    """
+
+    def __init__(self, feature_names, segment_features=None, min_segment_size=50,
+                 random_state=42):
+        """
+        Initialize the segmented model.
+
+        Parameters:
+        -----------
+        feature_names : list
+            Feature names in model order
+        segment_features : list
+            Features whose value combinations define the segments
+        min_segment_size : int
+            Segments with fewer training rows (or a single class) use the
+            global model
+        random_state : int
+            Random seed for reproducibility
+        """
+        self.feature_names = list(feature_names)
+        self.segment_features = list(segment_features or SEGMENT_FEATURES)
+        self.min_segment_size = min_segment_size
+        self.random_state = random_state
+
+        self.segment_columns = [self.feature_names.index(f) for f in self.segment_features]
+        self.levels = None
+        self.strides = None
+        self.segments = []
+        self.coef = None
+        self.intercept = None
+        self.route_table = None
+        self.metrics = None
+        self.timestamp = None
+
+    def _segment_codes(self, X):
+        """
+        Mixed-radix code of each row's segment key.
+
+        Returns:
+        --------
+        tuple
+            (codes, valid) where valid is False for values not seen in training
+        """
+        codes = np.zeros(len(X), dtype=np.int64)
+        valid = np.ones(len(X), dtype=bool)
+        for column, levels, stride in zip(self.segment_columns, self.levels, self.strides):
+            values = X[:, column]
+            positions = np.searchsorted(levels, values)
+            np.clip(positions, 0, len(levels) - 1, out=positions)
+            valid &= levels[positions] == values
+            codes += positions * stride
+        return codes, valid
+
+    def route(self, X):
+        """
+        Row of the stacked coefficient matrix serving each input row.
+
+        Parameters:
+        -----------
+        X : np.ndarray
+            Raw feature matrix
+
+        Returns:
+        --------
+        np.ndarray
+            Row index per input row (GLOBAL_ROW for unseen segments)
+        """
+        codes, valid = self._segment_codes(X)
+        # The last entry of the routing table is the unseen-segment slot
+        codes[~valid] = len(self.route_table) - 1
+        return self.route_table[codes]
+
+    def fit(self, X_raw, y, scaler, n_jobs=-1):
+        """
+        Fit the global model and one model per segment in parallel.
+
+        Parameters:
+        -----------
+        X_raw : np.ndarray or pd.DataFrame
+            Unscaled training features
+        y : np.ndarray or pd.Series
+            Training target
+        scaler : StandardScaler
+            Fitted scaler; models are trained on scaled features and fused
+            with it afterwards
+
+        Returns:
+        --------
+        SegmentedChurnModel
+            The fitted model
+        """
+        X_scaled = scaler.transform(X_raw)
+        X_raw = np.asarray(X_raw, dtype=np.float64)
+        y = np.asarray(y)
+
+        self.levels = [np.unique(X_raw[:, column]) for column in self.segment_columns]
+        sizes = [len(levels) for levels in self.levels]
+        self.strides = np.cumprod([1] + sizes[:-1]).astype(np.int64)
+
+        # Enumerate every combination of levels in code order
+        codes, _ = self._segment_codes(X_raw)
+        n_codes = int(np.prod(sizes))
+        keys = [
+            tuple(float(levels[(code // stride) % len(levels)])
+                  for levels, stride in zip(self.levels, self.strides))
+            for code in range(n_codes)
+        ]
+        trainable = [
+            code for code in range(n_codes)
+            if np.sum(codes == code) >= self.min_segment_size
+            and len(np.unique(y[codes == code])) == 2
+        ]
+
+        print(f"\nFitting global model and {len(trainable)} segment models in parallel "
+              f"(segments: {', '.join(self.segment_features)})...")
+        models = Parallel(n_jobs=n_jobs)(
+            [delayed(_fit_logistic_regression)(X_scaled, y, self.random_state)] +
+            [delayed(_fit_logistic_regression)(X_scaled[codes == code], y[codes == code],
+                                               self.random_state)
+             for code in trainable]
+        )
+
+        fused = [fuse_linear_model(model, scaler) for model in models]
+        self.coef = np.array([coef for coef, _ in fused])
+        self.intercept = np.array([intercept for _, intercept in fused])
+
+        self.route_table = np.full(n_codes + 1, GLOBAL_ROW, dtype=np.int64)
+        self.segments = []
+        for code in range(n_codes):
+            row = trainable.index(code) + 1 if code in trainable else GLOBAL_ROW
+            self.route_table[code] = row
+            self.segments.append({
+                'key': dict(zip(self.segment_features, keys[code])),
+                'row': row,
+                'n_train': int(np.sum(codes == code))
+            })
+
+        print(f"✓ Segment models trained ({len(self.coef)} rows in the stacked coefficient matrix)")
+        return self
+
+    def predict_proba(self, X):
+        """
+        Churn probability of each row from its segment's model.
+
+        Parameters:
+        -----------
+        X : np.ndarray
+            Raw feature matrix
+
+        Returns:
+        --------
+        np.ndarray
+            Probability of churn for each row
+        """
+        if len(X) == 0:
+            return np.empty(0, dtype=X.dtype)
+        return sigmoid(self._routed_logits(X, self.coef, self.intercept))
+
+    def _routed_logits(self, X, coef, intercept):
+        """
+        Logit of each row from its segment's row of the given coefficients.
+        """
+        rows = self.route(X)
+        logits = X @ coef.T
+        logits = np.take_along_axis(logits, rows[:, None], axis=1)[:, 0]
+        logits += intercept[rows]
+        return logits
+
+    def segment_sample(self, X):
+        """
+        Copy of X with the segment columns cycled through every segment key.
+
+        Parameters:
+        -----------
+        X : np.ndarray
+            Raw feature rows
+
+        Returns:
+        --------
+        np.ndarray
+            Rows covering every segment model and the global model
+        """
+        X = np.array(X, dtype=np.float64)
+        # Codes equal to the unseen-segment slot keep their original values
+        codes = np.arange(len(X)) % len(self.route_table)
+        seen = codes < len(self.route_table) - 1
+        for column, levels, stride in zip(self.segment_columns, self.levels, self.strides):
+            X[seen, column] = levels[(codes[seen] // stride) % len(levels)]
+        return X
+
+    def evaluate(self, X_raw, y, threshold=0.5):
+        """
+        Compare segment models with the global model on each segment.
+
+        Parameters:
+        -----------
+        X_raw : np.ndarray or pd.DataFrame
+            Unscaled test features
+        y : np.ndarray or pd.Series
+            Test target
+        threshold : float
+            Probability cut-off for the churn label
+
+        Returns:
+        --------
+        dict
+            Overall and per-segment ROC-AUC and accuracy
+        """
+        X_raw = np.asarray(X_raw, dtype=np.float64)
+        y = np.asarray(y)
+        segmented_proba = self.predict_proba(X_raw)
+        global_proba = sigmoid(X_raw @ self.coef[GLOBAL_ROW] + self.intercept[GLOBAL_ROW])
+        codes, valid = self._segment_codes(X_raw)
+
+        def scores(mask):
+            result = {
+                'n_test': int(mask.sum()),
+                'churn_rate': float(y[mask].mean()) if mask.any() else None,
+                'accuracy_segmented': None,
+                'accuracy_global': None,
+                'roc_auc_segmented': None,
+                'roc_auc_global': None
+            }
+            if mask.any():
+                result['accuracy_segmented'] = float(accuracy_score(y[mask], segmented_proba[mask] > threshold))
+                result['accuracy_global'] = float(accuracy_score(y[mask], global_proba[mask] > threshold))
+            if len(np.unique(y[mask])) == 2:
+                result['roc_auc_segmented'] = float(roc_auc_score(y[mask], segmented_proba[mask]))
+                result['roc_auc_global'] = float(roc_auc_score(y[mask], global_proba[mask]))
+            return result
+
+        per_segment = []
+        for code, segment in enumerate(self.segments):
+            per_segment.append({
+                **segment,
+                'model': 'segment' if segment['row'] != GLOBAL_ROW else 'global',
+                **scores(valid & (codes == code))
+            })
+
+        self.metrics = {
+            'overall': scores(np.ones(len(y), dtype=bool)),
+            'unseen_segment_rows': int(np.sum(~valid)),
+            'segments': per_segment
+        }
+        self.print_metrics()
+        return self.metrics
+
+    def print_metrics(self):
+        """
+        Print the per-segment comparison table.
+        """
+        def fmt(value):
+            return f"{value:.4f}" if value is not None else '   n/a'
+
+        print(f"\n{'Segment':<35} {'Model':<8} {'Test n':>6} {'Churn':>6} "
+              f"{'AUC seg':>8} {'AUC glob':>8}")
+        for segment in self.metrics['segments']:
+            key = ', '.join(f"{name}={value:g}" for name, value in segment['key'].items())
+            churn = f"{segment['churn_rate']:.3f}" if segment['churn_rate'] is not None else '  n/a'
+            print(f"{key:<35} {segment['model']:<8} {segment['n_test']:>6} {churn:>6} "
+                  f"{fmt(segment['roc_auc_segmented']):>8} {fmt(segment['roc_auc_global']):>8}")
+        overall = self.metrics['overall']
+        print(f"{'All':<35} {'':<8} {overall['n_test']:>6} {overall['churn_rate']:>6.3f} "
+              f"{fmt(overall['roc_auc_segmented']):>8} {fmt(overall['roc_auc_global']):>8}")
+
+    def save(self, filepath='models/segment_models.pkl'):
+        """
+        Save the stacked coefficients, routing table and metrics.
+
+        Parameters:
+        -----------
+        filepath : str
+            Path to save the segmented model
+        """
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        self.timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        joblib.dump({
+            'feature_names': self.feature_names,
+            'segment_features': self.segment_features,
+            'min_segment_size': self.min_segment_size,
+            'levels': self.levels,
+            'strides': self.strides,
+            'segments': self.segments,
+            'coef': self.coef,
+            'intercept': self.intercept,
+            'route_table': self.route_table,
+            'metrics': self.metrics,
+            'timestamp': self.timestamp
+        }, filepath)
+        print(f"✓ Segment models saved to {filepath}")
+
+    @classmethod
+    def load(cls, filepath='models/segment_models.pkl'):
+        """
+        Load a segmented model saved by save().
+
+        Parameters:
+        -----------
+        filepath : str
+            Path to load the segmented model from
+
+        Returns:
+        --------
+        SegmentedChurnModel
+            Model ready for scoring
+        """
+        data = joblib.load(filepath)
+        model = cls(data['feature_names'], data['segment_features'], data['min_segment_size'])
+        for key in ('levels', 'strides', 'segments', 'coef', 'intercept', 'route_table', 'metrics'):
+            setattr(model, key, data[key])
+        model.timestamp = data.get('timestamp')
+        return model
+
+
+class SegmentedScorer(ChurnScorer):
+    """
+    A scorer that serves a SegmentedChurnModel through the ChurnScorer
+    interface used by the web application and the streaming worker.
+    """
+
+    def __init__(self, segmented_model, threshold=0.5):
+        """
+        Initialize the scorer.
+
+        Parameters:
+        -----------
+        segmented_model : SegmentedChurnModel
+            Fitted segmented model
+        threshold : float
+            Probability cut-off for the churn label
+        """
+        self.model = segmented_model
+        self.scaler = None
+        self.feature_names = segmented_model.feature_names
+        self.threshold = threshold
+        self.dtype = np.float64
+        self.coef, self.intercept = None, None
+        self.model_version = f"segments {segmented_model.timestamp or 'N/A'}"
+
+    def enable_reduced_precision(self, reference_X, tolerance=1e-4):
+        """
+        Switch the stacked coefficients to float32 if they match float64
+        within tolerance.
+
+        The segment columns of the reference rows are cycled through every
+        segment key, so each segment model and the global model are checked
+        with both sigmoid kernels.
+
+        Parameters:
+        -----------
+        reference_X : np.ndarray
+            Raw feature rows used for the comparison
+        tolerance : float
+            Maximum allowed absolute difference in churn probability
+
+        Returns:
+        --------
+        tuple
+            (enabled, max_abs_diff)
+        """
+        model = self.model
+        reference_X = model.segment_sample(reference_X)
+        proba64 = sigmoid(model._routed_logits(reference_X, model.coef, model.intercept))
+
+        coef32 = model.coef.astype(np.float32)
+        intercept32 = model.intercept.astype(np.float32)
+        logits32 = model._routed_logits(reference_X.astype(np.float32), coef32, intercept32)
+
+        max_abs_diff = max(
+            float(np.max(np.abs(proba32.astype(np.float64) - proba64)))
+            for proba32 in (expit(logits32), _sigmoid_tanh(logits32))
+        )
+        if max_abs_diff > tolerance:
+            return False, max_abs_diff
+
+        model.coef, model.intercept = coef32, intercept32
+        self.dtype = np.float32
+        return True, max_abs_diff
+
+    def predict_proba(self, X):
+        """
+        Compute churn probabilities, routing each row to its segment model.
+        """
+        return self.model.predict_proba(X)
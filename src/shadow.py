@@ -0,0 +1,229 @@
+"""
+Shadow Scoring Module
+---------------------
+This module scores a challenger model next to the serving (champion)
+model on live traffic without changing what callers receive.
+
+When both models are linear and use the same features, their fused
+coefficient vectors are stacked into one matrix so that a batch is scored
+by both models in a single matrix multiply. Agreement statistics are
+aggregated incrementally and only the champion's scores are returned.
+"""
+
+import numpy as np
+import threading
+
+from inference import sigmoid
+
+
+class ShadowStats:
+    """
+    A class to aggregate champion/challenger differences incrementally.
+    """
+
+    def __init__(self):
+        """
+        Initialize empty statistics.
+        """
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """
+        Clear all aggregated statistics.
+        """
+        with self._lock:
+            self.count = 0
+            self.disagreements = 0
+            self.mean_diff = 0.0
+            self.m2_diff = 0.0
+            self.max_abs_diff = 0.0
+
+    def update(self, champion_proba, challenger_proba, threshold=0.5):
+        """
+        Merge a batch of paired probabilities into the running statistics.
+
+        Uses the parallel variance formula so a batch is merged in O(1)
+        after its own vectorized moments are computed.
+
+        Parameters:
+        -----------
+        champion_proba : np.ndarray
+            Champion churn probabilities
+        challenger_proba : np.ndarray
+            Challenger churn probabilities for the same rows
+        threshold : float
+            Probability cut-off for the churn label
+        """
+        diff = challenger_proba.astype(np.float64) - champion_proba.astype(np.float64)
+        # A non-finite score would poison the running moments for good
+        finite = np.isfinite(diff)
+        if not finite.all():
+            diff = diff[finite]
+            champion_proba = champion_proba[finite]
+            challenger_proba = challenger_proba[finite]
+
+        n = len(diff)
+        if n == 0:
+            return
+
+        batch_mean = float(diff.mean())
+        batch_m2 = float(((diff - batch_mean) ** 2).sum())
+        batch_disagreements = int(np.count_nonzero(
+            (champion_proba > threshold) != (challenger_proba > threshold)
+        ))
+        batch_max = float(np.abs(diff).max())
+
+        with self._lock:
+            total = self.count + n
+            delta = batch_mean - self.mean_diff
+            self.mean_diff += delta * n / total
+            self.m2_diff += batch_m2 + delta ** 2 * self.count * n / total
+            self.count = total
+            self.disagreements += batch_disagreements
+            self.max_abs_diff = max(self.max_abs_diff, batch_max)
+
+    def summary(self):
+        """
+        Snapshot of the aggregated statistics.
+
+        Returns:
+        --------
+        dict
+            Row count, disagreement rate and score-difference statistics
+        """
+        with self._lock:
+            return {
+                'rows_scored': self.count,
+                'disagreements': self.disagreements,
+                'disagreement_rate': self.disagreements / self.count if self.count else 0.0,
+                'mean_score_diff': self.mean_diff,
+                'std_score_diff': float(np.sqrt(self.m2_diff / self.count)) if self.count else 0.0,
+                'max_abs_score_diff': self.max_abs_diff
+            }
+
+
+class ShadowScorer:
+    """
+    A class to score champion and challenger models together.
+    """
+
+    def __init__(self, champion, challenger, reference_X=None, tolerance=1e-4):
+        """
+        Initialize the shadow scorer.
+
+        Parameters:
+        -----------
+        champion : ChurnScorer
+            Model whose scores are returned to callers
+        challenger : ChurnScorer
+            Model scored in the shadow
+        reference_X : np.ndarray
+            Raw feature rows used to check the challenger in float32 when
+            the champion scores in float32
+        tolerance : float
+            Maximum allowed absolute difference in challenger churn
+            probability between float32 and float64
+
+        Raises:
+        -------
+        ValueError
+            If the two models do not use the same features
+        """
+        if champion.feature_names != challenger.feature_names:
+            raise ValueError('Champion and challenger must use the same features in the same order')
+
+        self.champion = champion
+        self.challenger = challenger
+        self.threshold = champion.threshold
+        self.dtype = champion.dtype
+        self.feature_names = champion.feature_names
+        self.enabled = True
+        self.stats = ShadowStats()
+        self.challenger_float32_diff = None
+
+        # Stacking casts the challenger to the champion's dtype, so a
+        # float32 champion needs the challenger to pass the same check
+        stackable = champion.is_fused and challenger.is_fused
+        if stackable and self.dtype == np.float32 and challenger.dtype != np.float32:
+            if reference_X is None:
+                stackable = False
+            else:
+                stackable, self.challenger_float32_diff = challenger.enable_reduced_precision(
+                    reference_X, tolerance
+                )
+
+        if stackable:
+            self.coef = np.column_stack([champion.coef, challenger.coef]).astype(self.dtype)
+            self.intercept = np.array([champion.intercept, challenger.intercept], dtype=self.dtype)
+        else:
+            self.coef, self.intercept = None, None
+
+    @property
+    def is_stacked(self):
+        """Whether both models are scored with one matrix multiply."""
+        return self.coef is not None
+
+    def predict_proba(self, X):
+        """
+        Compute champion churn probabilities, scoring the challenger in
+        the same pass when shadowing is enabled.
+
+        Parameters:
+        -----------
+        X : np.ndarray
+            Raw feature matrix
+
+        Returns:
+        --------
+        np.ndarray
+            Champion probability of churn for each row
+        """
+        if not self.enabled or len(X) == 0:
+            return self.champion.predict_proba(X)
+
+        if self.is_stacked:
+            logits = X @ self.coef
+            logits += self.intercept
+            proba = sigmoid(logits)
+            champion_proba, challenger_proba = proba[:, 0], proba[:, 1]
+        else:
+            champion_proba = self.champion.predict_proba(X)
+            challenger_proba = self.challenger.predict_proba(X)
+
+        self.stats.update(champion_proba, challenger_proba, self.threshold)
+        return champion_proba
+
+    def predict(self, X):
+        """
+        Compute champion churn labels and probabilities.
+
+        Parameters:
+        -----------
+        X : np.ndarray
+            Raw feature matrix
+
+        Returns:
+        --------
+        tuple
+            (predictions, churn_probabilities)
+        """
+        probabilities = self.predict_proba(X)
+        predictions = (probabilities > self.threshold).astype(int)
+        return predictions, probabilities
+
+    def metrics(self):
+        """
+        Snapshot of the shadow configuration and statistics.
+
+        Returns:
+        --------
+        dict
+            Enabled flag, scoring mode and aggregated statistics
+        """
+        return {
+            'enabled': self.enabled,
+            'stacked': self.is_stacked,
+            'challenger_float32_diff': self.challenger_float32_diff,
+            **self.stats.summary()
+        }
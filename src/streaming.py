@@ -0,0 +1,294 @@
+"""
+Streaming Scoring Module
+------------------------
+This module scores newline-delimited JSON (NDJSON) customer records read
+from a pipe or a local socket.
+
+Records are parsed by a reader thread and placed on a bounded queue. The
+scoring thread drains the queue in micro-batches, scores each batch in one
+vectorized call and writes the results back in input order. When the queue
+is full the reader blocks, which stops consuming the input stream and
+pushes backpressure onto the producer.
+"""
+
+import json
+import os
+import queue
+import socket
+import socketserver
+import sys
+import threading
+import time
+
+
+_EOF = object()
+
+# Seconds between checks of the stop flag while the queue is full
+_PUT_POLL_INTERVAL = 0.1
+
+
+def parse_address(address):
+    """
+    Parse a socket address specification.
+
+    Parameters:
+    -----------
+    address : str
+        Either 'unix:/path/to/socket' or 'tcp:host:port'
+
+    Returns:
+    --------
+    tuple
+        (family, address) usable with socket.socket
+    """
+    if address.startswith('unix:'):
+        return socket.AF_UNIX, address[len('unix:'):]
+    if address.startswith('tcp:'):
+        host, _, port = address[len('tcp:'):].rpartition(':')
+        return socket.AF_INET, (host or '127.0.0.1', int(port))
+    raise ValueError(
+        f"Invalid address '{address}'. Use 'unix:/path' or 'tcp:host:port'."
+    )
+
+
+class StreamScoringWorker:
+    """
+    A class to score NDJSON record streams in ordered micro-batches.
+    """
+
+    def __init__(self, scorer, batch_size=256, max_batch_delay=0.005, queue_size=4096):
+        """
+        Initialize the worker.
+
+        Parameters:
+        -----------
+        scorer : ChurnScorer
+            Scorer built from the saved model artifacts
+        batch_size : int
+            Maximum number of records scored together
+        max_batch_delay : float
+            Seconds to wait for a batch to fill before scoring it
+        queue_size : int
+            Maximum number of parsed records buffered ahead of scoring
+        """
+        self.scorer = scorer
+        self.batch_size = batch_size
+        self.max_batch_delay = max_batch_delay
+        self.queue_size = queue_size
+
+        self._lock = threading.Lock()
+        self.stats = {
+            'records_in': 0,
+            'records_out': 0,
+            'errors': 0,
+            'batches': 0,
+            'disconnects': 0
+        }
+
+    @staticmethod
+    def _put(pending, item, stop):
+        """
+        Enqueue an item, blocking while the queue is full until stop is set.
+
+        Returns:
+        --------
+        bool
+            False if the item was discarded because stop was set
+        """
+        while not stop.is_set():
+            try:
+                pending.put(item, timeout=_PUT_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _read(self, in_stream, pending, stop):
+        """
+        Parse input lines and enqueue them, blocking while the queue is full.
+        Stops early once the scoring side sets stop.
+        """
+        line_no = 0
+        try:
+            for line in in_stream:
+                line_no += 1
+                if not line.strip():
+                    continue
+                try:
+                    item = (line_no, json.loads(line), None)
+                except ValueError as e:
+                    item = (line_no, None, f'Invalid JSON: {str(e)}')
+                if not self._put(pending, item, stop):
+                    return
+        except (OSError, ValueError) as e:
+            if not stop.is_set():
+                print(f"⚠ Warning: input stream closed: {str(e)}", file=sys.stderr)
+        finally:
+            self._put(pending, _EOF, stop)
+
+    def _next_batch(self, pending):
+        """
+        Collect up to batch_size items, waiting at most max_batch_delay
+        after the first one arrives.
+
+        Returns:
+        --------
+        tuple
+            (batch, reached_eof)
+        """
+        item = pending.get()
+        if item is _EOF:
+            return [], True
+
+        batch = [item]
+        deadline = time.monotonic() + self.max_batch_delay
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    item = pending.get(timeout=remaining)
+                else:
+                    item = pending.get_nowait()
+            except queue.Empty:
+                break
+            if item is _EOF:
+                return batch, True
+            batch.append(item)
+
+        return batch, False
+
+    def score_batch(self, batch):
+        """
+        Score a batch of parsed items.
+
+        Parameters:
+        -----------
+        batch : list of tuple
+            (line_no, record, parse_error) items in input order
+
+        Returns:
+        --------
+        list of dict
+            Output records in the same order as the batch
+        """
+        records = [record for _, record, error in batch if error is None]
+        X, errors = self.scorer.records_to_matrix(records)
+        predictions, probabilities = self.scorer.predict(X)
+
+        results = []
+        record_idx = 0
+        row_idx = 0
+        for line_no, record, error in batch:
+            if error is not None:
+                results.append({'line': line_no, 'error': error})
+                continue
+
+            if record_idx in errors:
+                results.append({'line': line_no, 'error': errors[record_idx]})
+            else:
+                result = dict(record)
+                result['prediction'] = int(predictions[row_idx])
+                result['churn_probability'] = round(float(probabilities[row_idx]), 6)
+                results.append(result)
+                row_idx += 1
+            record_idx += 1
+
+        return results
+
+    def process(self, in_stream, out_stream):
+        """
+        Score every record of an input stream until end of input.
+
+        Parameters:
+        -----------
+        in_stream : binary file-like
+            Source of NDJSON lines
+        out_stream : binary file-like
+            Destination for scored NDJSON lines
+
+        Returns:
+        --------
+        bool
+            False if the output was closed by the consumer before the end
+            of input
+        """
+        pending = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+        reader = threading.Thread(
+            target=self._read, args=(in_stream, pending, stop), daemon=True
+        )
+        reader.start()
+
+        completed = True
+        done = False
+        try:
+            while not done:
+                batch, done = self._next_batch(pending)
+                if not batch:
+                    continue
+
+                try:
+                    results = self.score_batch(batch)
+                except Exception as e:
+                    # Report the batch as failed instead of ending the stream
+                    print(f"⚠ Warning: batch scoring failed: {str(e)}", file=sys.stderr)
+                    results = [{'line': line_no, 'error': f'Scoring failed: {str(e)}'}
+                               for line_no, _, _ in batch]
+                n_errors = sum(1 for result in results if 'error' in result)
+                payload = ''.join(json.dumps(result) + '\n' for result in results)
+                out_stream.write(payload.encode('utf-8'))
+                out_stream.flush()
+
+                with self._lock:
+                    self.stats['records_in'] += len(batch)
+                    self.stats['records_out'] += len(results)
+                    self.stats['errors'] += n_errors
+                    self.stats['batches'] += 1
+        except (BrokenPipeError, ConnectionResetError):
+            completed = False
+            with self._lock:
+                self.stats['disconnects'] += 1
+            print("⚠ Warning: output closed by the consumer, stopping this stream",
+                  file=sys.stderr)
+        finally:
+            # Release a reader blocked on the full queue and wait for it
+            stop.set()
+            reader.join()
+
+        return completed
+
+    def serve(self, address):
+        """
+        Accept connections on a local socket and score each connection's
+        stream independently until interrupted.
+
+        Parameters:
+        -----------
+        address : str
+            Either 'unix:/path/to/socket' or 'tcp:host:port'
+        """
+        family, bind_address = parse_address(address)
+        worker = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                worker.process(self.rfile, self.wfile)
+
+        if family == socket.AF_UNIX:
+            if os.path.exists(bind_address):
+                os.remove(bind_address)
+            base_class = socketserver.ThreadingUnixStreamServer
+        else:
+            base_class = socketserver.ThreadingTCPServer
+
+        class Server(base_class):
+            allow_reuse_address = True
+            daemon_threads = True
+
+        with Server(bind_address, Handler) as server:
+            print(f"✓ Listening on {address}", file=sys.stderr)
+            try:
+                server.serve_forever()
+            finally:
+                if family == socket.AF_UNIX and os.path.exists(bind_address):
+                    os.remove(bind_address)
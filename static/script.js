@@ -1,5 +1,20 @@
 // Form handling and API interaction
 
+// Maximum number of predictions remembered for identical inputs
+const PREDICTION_CACHE_SIZE = 5000;
+
+// Records per /predict/batch request when the server does not report its limit
+const DEFAULT_BATCH_SIZE = 500;
+
+// Retries of a batch request rejected with 429 or 503
+const MAX_RETRIES = 3;
+
+// Predictions keyed by the canonical JSON of their input features
+const predictionCache = new Map();
+
+// Model information from /api/info, fetched once per page load
+let modelInfoPromise = null;
+
 document.addEventListener('DOMContentLoaded', function() {
     console.log('Churn Prediction System loaded');
     
@@ -45,6 +60,14 @@ async function handleFormSubmit(event) {
     // Collect form data
     const formData = collectFormData();
     
+    // Identical inputs are answered from the cache without a request
+    const cached = getCachedPrediction(formData);
+    if (cached) {
+        hideLoading();
+        displayResults(cached, formData);
+        return;
+    }
+    
     try {
         // Make prediction request
         const response = await fetch('/predict', {
@@ -61,7 +84,8 @@ async function handleFormSubmit(event) {
         hideLoading();
         
         if (data.success) {
-            displayResults(data);
+            setCachedPrediction(formData, data);
+            displayResults(data, formData);
         } else {
             displayError(data.error || 'An error occurred during prediction');
         }
@@ -89,10 +113,41 @@ function collectFormData() {
     return data;
 }
 
+/**
+ * Canonical cache key of a set of features: the same values give the same
+ * key regardless of the order in which the fields were read
+ */
+function cacheKey(features) {
+    return JSON.stringify(Object.keys(features).sort().map(key => [key, features[key]]));
+}
+
+/**
+ * Look up a cached prediction for the given features
+ */
+function getCachedPrediction(features) {
+    return predictionCache.get(cacheKey(features));
+}
+
+/**
+ * Remember a prediction, evicting the oldest entry when the cache is full
+ */
+function setCachedPrediction(features, result) {
+    const key = cacheKey(features);
+    predictionCache.delete(key);
+    predictionCache.set(key, {
+        prediction: result.prediction,
+        prediction_label: result.prediction_label,
+        probability: result.probability
+    });
+    if (predictionCache.size > PREDICTION_CACHE_SIZE) {
+        predictionCache.delete(predictionCache.keys().next().value);
+    }
+}
+
 /**
  * Display prediction results
  */
-function displayResults(data) {
+function displayResults(data, features) {
     const resultsSection = document.getElementById('resultsSection');
     const predictionLabel = document.getElementById('predictionLabel');
     const resultDescription = document.getElementById('resultDescription');
@@ -125,7 +180,7 @@ function displayResults(data) {
     }, 100);
     
     // Generate recommendations
-    const recommendationHTML = generateRecommendations(data);
+    const recommendationHTML = generateRecommendations(data, features);
     recommendation.innerHTML = recommendationHTML;
     
     // Show results section
@@ -138,7 +193,7 @@ function displayResults(data) {
 /**
  * Generate personalized recommendations based on prediction
  */
-function generateRecommendations(data) {
+function generateRecommendations(data, features) {
     let html = '<h4><i class="fas fa-lightbulb"></i> Recommendations</h4><ul>';
     
     if (data.prediction === 1) {
@@ -149,13 +204,13 @@ function generateRecommendations(data) {
         html += '<li>Schedule a follow-up call to understand concerns</li>';
         
         // Analyze input features for specific recommendations
-        if (data.input_features.CustServCalls >= 4) {
+        if (features.CustServCalls >= 4) {
             html += '<li><strong>Alert:</strong> High customer service calls detected - investigate issues</li>';
         }
-        if (data.input_features.ContractRenewal === 0) {
+        if (features.ContractRenewal === 0) {
             html += '<li><strong>Alert:</strong> Contract not renewed - offer renewal incentives</li>';
         }
-        if (data.input_features.OverageFee > 15) {
+        if (features.OverageFee > 15) {
             html += '<li>Consider upgrading customer to a higher plan to reduce overage fees</li>';
         }
     } else {
@@ -166,10 +221,10 @@ function generateRecommendations(data) {
         html += '<li>Reward loyalty with exclusive offers</li>';
         
         // Positive reinforcement
-        if (data.input_features.ContractRenewal === 1) {
+        if (features.ContractRenewal === 1) {
             html += '<li><strong>Positive:</strong> Contract renewed - customer shows commitment</li>';
         }
-        if (data.input_features.CustServCalls <= 1) {
+        if (features.CustServCalls <= 1) {
             html += '<li><strong>Positive:</strong> Low customer service calls - good service experience</li>';
         }
     }
@@ -178,6 +233,216 @@ function generateRecommendations(data) {
     return html;
 }
 
+/**
+ * Fetch model information once; the browser revalidates it with its ETag
+ */
+function getModelInfo() {
+    if (!modelInfoPromise) {
+        modelInfoPromise = fetch('/api/info')
+            .then(response => response.json())
+            .then(info => info.success ? info : null)
+            .catch(() => null);
+    }
+    return modelInfoPromise;
+}
+
+/**
+ * Parse CSV text into a header row and data rows
+ */
+function parseCsv(text) {
+    const rows = [];
+    let row = [];
+    let field = '';
+    let inQuotes = false;
+    
+    for (let i = 0; i < text.length; i++) {
+        const char = text[i];
+        if (inQuotes) {
+            if (char === '"' && text[i + 1] === '"') {
+                field += '"';
+                i++;
+            } else if (char === '"') {
+                inQuotes = false;
+            } else {
+                field += char;
+            }
+        } else if (char === '"') {
+            inQuotes = true;
+        } else if (char === ',') {
+            row.push(field);
+            field = '';
+        } else if (char === '\n' || char === '\r') {
+            if (char === '\r' && text[i + 1] === '\n') {
+                i++;
+            }
+            row.push(field);
+            rows.push(row);
+            row = [];
+            field = '';
+        } else {
+            field += char;
+        }
+    }
+    if (field !== '' || row.length > 0) {
+        row.push(field);
+        rows.push(row);
+    }
+    
+    const nonEmpty = rows.filter(r => r.some(value => value.trim() !== ''));
+    return {
+        header: (nonEmpty[0] || []).map(name => name.trim()),
+        rows: nonEmpty.slice(1)
+    };
+}
+
+/**
+ * POST a batch of records, waiting and retrying when the server sheds load
+ */
+async function postBatch(records) {
+    for (let attempt = 0; ; attempt++) {
+        const response = await fetch('/predict/batch', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({ records: records })
+        });
+        
+        if ((response.status === 429 || response.status === 503) && attempt < MAX_RETRIES) {
+            const retryAfter = parseFloat(response.headers.get('Retry-After')) || 1;
+            await new Promise(resolve => setTimeout(resolve, retryAfter * 1000));
+            continue;
+        }
+        
+        const data = await response.json();
+        if (!data.success) {
+            throw new Error(data.error || 'An error occurred during batch prediction');
+        }
+        return data.results;
+    }
+}
+
+/**
+ * Score an uploaded CSV file in chunks, rendering each chunk as it completes
+ */
+async function scoreCsvFile() {
+    const fileInput = document.getElementById('csvFile');
+    const button = document.getElementById('csvScoreButton');
+    const status = document.getElementById('batchStatus');
+    const tableContainer = document.getElementById('batchTableContainer');
+    const tbody = document.getElementById('batchResults');
+    
+    hideError();
+    if (!fileInput.files.length) {
+        displayError('Please choose a CSV file to score.');
+        return;
+    }
+    
+    const info = await getModelInfo();
+    const featureNames = info ? info.features
+        : Array.from(new FormData(document.getElementById('predictionForm')).keys());
+    const batchSize = Math.min(DEFAULT_BATCH_SIZE, info ? info.max_batch_size : DEFAULT_BATCH_SIZE);
+    
+    const { header, rows } = parseCsv(await fileInput.files[0].text());
+    const missing = featureNames.filter(name => !header.includes(name));
+    if (missing.length) {
+        displayError('Missing columns in CSV file: ' + missing.join(', '));
+        return;
+    }
+    if (!rows.length) {
+        displayError('The CSV file contains no customers.');
+        return;
+    }
+    
+    const columns = featureNames.map(name => header.indexOf(name));
+    const customers = rows.map(row => {
+        const features = {};
+        featureNames.forEach((name, i) => {
+            features[name] = parseFloat(row[columns[i]]);
+        });
+        return features;
+    });
+    
+    button.disabled = true;
+    tbody.innerHTML = '';
+    tableContainer.style.display = 'block';
+    
+    let requests = 0;
+    let scored = 0;
+    let churners = 0;
+    let failed = 0;
+    
+    try {
+        for (let start = 0; start < customers.length; start += batchSize) {
+            const chunk = customers.slice(start, start + batchSize);
+            
+            // Send each distinct uncached customer of the chunk once
+            const pending = new Map();
+            chunk.forEach(features => {
+                const key = cacheKey(features);
+                if (!predictionCache.has(key) && !pending.has(key)) {
+                    pending.set(key, features);
+                }
+            });
+            
+            const errors = new Map();
+            if (pending.size) {
+                const results = await postBatch(Array.from(pending.values()));
+                requests++;
+                Array.from(pending.entries()).forEach(([key, features], i) => {
+                    if (results[i].success) {
+                        setCachedPrediction(features, results[i]);
+                    } else {
+                        errors.set(key, results[i].error);
+                    }
+                });
+            }
+            
+            // Render the chunk in input order
+            const fragment = document.createDocumentFragment();
+            chunk.forEach((features, i) => {
+                const key = cacheKey(features);
+                const result = predictionCache.get(key);
+                const tr = document.createElement('tr');
+                const cells = [
+                    start + i + 1,
+                    features.ContractRenewal === 1 ? 'Yes' : 'No',
+                    features.DataPlan === 1 ? 'Yes' : 'No',
+                    features.CustServCalls,
+                    features.MonthlyCharge
+                ];
+                if (result) {
+                    cells.push(result.prediction_label, result.probability.churn + '%');
+                    if (result.prediction === 1) {
+                        tr.className = 'row-churn';
+                        churners++;
+                    }
+                } else {
+                    cells.push('Error', errors.get(key) || 'Not scored');
+                    tr.className = 'row-error';
+                    failed++;
+                }
+                cells.forEach(value => {
+                    const td = document.createElement('td');
+                    td.textContent = value;
+                    tr.appendChild(td);
+                });
+                fragment.appendChild(tr);
+            });
+            tbody.appendChild(fragment);
+            
+            scored += chunk.length;
+            status.textContent = `Scored ${scored} of ${customers.length} customers ` +
+                `(${churners} likely to churn, ${failed} errors) with ${requests} server requests`;
+        }
+    } catch (error) {
+        console.error('Error:', error);
+        displayError(error.message || 'Failed to connect to the server. Please try again.');
+    } finally {
+        button.disabled = false;
+    }
+}
+
 /**
  * Display error message
  */
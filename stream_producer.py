@@ -0,0 +1,119 @@
+"""
+Streaming Producer
+------------------
+Local stand-in for the event bus: turns rows of the churn dataset into
+newline-delimited JSON customer records.
+
+Usage:
+    python stream_producer.py | python stream_score.py
+    python stream_producer.py --connect unix:/tmp/churn.sock --repeat 100
+
+With --connect the producer sends records to a running stream_score.py
+worker, reads the scored records back and reports throughput.
+"""
+
+import argparse
+import csv
+import json
+import socket
+import sys
+import os
+import threading
+import time
+
+# Add src directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from streaming import parse_address
+
+
+def parse_args():
+    """
+    Parse command line arguments.
+    """
+    parser = argparse.ArgumentParser(description='Emit customer records as NDJSON.')
+    parser.add_argument('--data', default='telecom_churn.csv',
+                        help='CSV file to read customer records from')
+    parser.add_argument('--connect', default=None,
+                        help="Worker socket ('unix:/path' or 'tcp:host:port'). "
+                             "Writes to stdout when omitted.")
+    parser.add_argument('--repeat', type=int, default=1,
+                        help='Number of passes over the dataset')
+    parser.add_argument('--keep-label', action='store_true',
+                        help="Keep the 'Churn' column in the emitted records")
+    return parser.parse_args()
+
+
+def iter_records(data_path, repeat=1, keep_label=False):
+    """
+    Yield NDJSON lines for every row of the dataset.
+    """
+    with open(data_path, newline='') as f:
+        rows = list(csv.DictReader(f))
+
+    record_id = 0
+    for _ in range(repeat):
+        for row in rows:
+            record = {'id': record_id}
+            for key, value in row.items():
+                if key == 'Churn' and not keep_label:
+                    continue
+                record[key] = float(value)
+            record_id += 1
+            yield (json.dumps(record) + '\n').encode('utf-8')
+
+
+def send_to_worker(address, lines):
+    """
+    Stream records to a worker socket and count the scored records returned.
+    """
+    family, connect_address = parse_address(address)
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.connect(connect_address)
+
+    def write_all():
+        for line in lines:
+            sock.sendall(line)
+        sock.shutdown(socket.SHUT_WR)
+
+    start = time.perf_counter()
+    writer = threading.Thread(target=write_all, daemon=True)
+    writer.start()
+
+    n_scored = 0
+    n_errors = 0
+    with sock.makefile('rb') as responses:
+        for line in responses:
+            n_scored += 1
+            if b'"error"' in line:
+                n_errors += 1
+    writer.join()
+    sock.close()
+
+    elapsed = time.perf_counter() - start
+    rate = n_scored / elapsed if elapsed > 0 else 0.0
+    print(f"✓ Received {n_scored} scored records ({n_errors} errors) "
+          f"in {elapsed:.2f}s ({rate:,.0f} records/s)", file=sys.stderr)
+
+
+def main():
+    """
+    Emit records to stdout or send them to a worker socket.
+    """
+    args = parse_args()
+    lines = iter_records(args.data, args.repeat, args.keep_label)
+
+    if args.connect:
+        send_to_worker(args.connect, lines)
+    else:
+        out = sys.stdout.buffer
+        try:
+            for line in lines:
+                out.write(line)
+            out.flush()
+        except BrokenPipeError:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Streaming Scoring Worker
+------------------------
+Long-running worker that scores newline-delimited JSON customer records
+with the same model artifacts used by the Flask application.
+
+Usage:
+    python stream_score.py < customers.ndjson > scored.ndjson
+    python stream_score.py --listen unix:/tmp/churn.sock
+    python stream_score.py --listen tcp:127.0.0.1:9000
+
+Scored records are written in input order. Diagnostics go to stderr so
+stdout carries only scored records.
+"""
+
+import argparse
+import sys
+import os
+import time
+
+# Add src directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from inference import ChurnScorer, reference_sample
+from profiling import load_profile
+from streaming import StreamScoringWorker
+
+
+def parse_args():
+    """
+    Parse command line arguments.
+    """
+    parser = argparse.ArgumentParser(description='Score NDJSON customer records.')
+    parser.add_argument('--listen', default=None,
+                        help="Socket to listen on ('unix:/path' or 'tcp:host:port'). "
+                             "Reads stdin when omitted.")
+    parser.add_argument('--batch-size', type=int, default=256,
+                        help='Maximum records scored per micro-batch')
+    parser.add_argument('--max-delay-ms', type=float, default=5.0,
+                        help='Maximum time to wait for a micro-batch to fill')
+    parser.add_argument('--queue-size', type=int, default=4096,
+                        help='Parsed records buffered ahead of scoring')
+    parser.add_argument('--float32', action='store_true',
+                        help='Score in float32 if it matches float64 within --float32-tolerance')
+    parser.add_argument('--float32-tolerance', type=float, default=1e-4,
+                        help='Maximum allowed churn probability difference for float32')
+    parser.add_argument('--model', default='models/churn_model.pkl')
+    parser.add_argument('--scaler', default='models/scaler.pkl')
+    parser.add_argument('--feature-names', default='models/feature_names.pkl')
+    parser.add_argument('--profile', default='models/data_profile.json')
+    return parser.parse_args()
+
+
+def main():
+    """
+    Load the artifacts and run the worker on stdin or a socket.
+    """
+    args = parse_args()
+
+    try:
+        scorer = ChurnScorer.from_artifacts(args.model, args.scaler, args.feature_names)
+    except FileNotFoundError as e:
+        print(f"✗ {str(e)}", file=sys.stderr)
+        sys.exit(1)
+    print(f"✓ Model artifacts loaded (fused linear path: {scorer.is_fused})", file=sys.stderr)
+
+    if args.float32:
+        sample = reference_sample(scorer.feature_names, scorer.scaler, load_profile(args.profile))
+        enabled, max_abs_diff = scorer.enable_reduced_precision(sample, args.float32_tolerance)
+        if enabled:
+            print(f"✓ Float32 scoring enabled (max probability difference: {max_abs_diff:.2e})",
+                  file=sys.stderr)
+        else:
+            print("⚠ Warning: Float32 scoring refused, staying on float64", file=sys.stderr)
+
+    worker = StreamScoringWorker(
+        scorer,
+        batch_size=args.batch_size,
+        max_batch_delay=args.max_delay_ms / 1000.0,
+        queue_size=args.queue_size
+    )
+
+    start = time.perf_counter()
+    try:
+        if args.listen:
+            worker.serve(args.listen)
+        else:
+            if not worker.process(sys.stdin.buffer, sys.stdout.buffer):
+                # Stdout is gone (e.g. piped into head); stop the interpreter
+                # from failing again when it flushes stdout at exit
+                os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        elapsed = time.perf_counter() - start
+        stats = worker.stats
+        rate = stats['records_out'] / elapsed if elapsed > 0 else 0.0
+        print(f"✓ Scored {stats['records_out']} records in {stats['batches']} batches "
+              f"({stats['errors']} errors, {stats['disconnects']} disconnects, "
+              f"{rate:,.0f} records/s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Tests for the admission control module.
+"""
+
+import sys
+import os
+import time
+
+import pytest
+
+# Add src directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from admission import (AdmissionController, ADMITTED, REJECTED, EXPIRED,
+                       DEADLINE_HEADER, TIMEOUT_HEADER)
+
+
+def test_queue_full_is_rejected():
+    controller = AdmissionController(max_concurrency=1, max_queue=0)
+    assert controller.acquire(time.time() + 1) == ADMITTED
+    assert controller.acquire(time.time() + 1) == REJECTED
+    assert controller.metrics()['rejected'] == 1
+    controller.release()
+    assert controller.acquire(time.time() + 1) == ADMITTED
+
+
+def test_expires_while_waiting():
+    controller = AdmissionController(max_concurrency=1, max_queue=1)
+    assert controller.acquire(time.time() + 1) == ADMITTED
+
+    start = time.monotonic()
+    assert controller.acquire(time.time() + 0.1) == EXPIRED
+    assert time.monotonic() - start < 1
+    metrics = controller.metrics()
+    assert metrics['expired'] == 1
+    assert metrics['waiting'] == 0
+
+
+def test_past_deadline_is_expired():
+    controller = AdmissionController()
+    assert controller.acquire(time.time() - 1) == EXPIRED
+    assert controller.metrics()['in_flight'] == 0
+
+
+@pytest.mark.parametrize('headers', [
+    {TIMEOUT_HEADER: 'nan'},
+    {TIMEOUT_HEADER: 'inf'},
+    {TIMEOUT_HEADER: 'abc'},
+    {DEADLINE_HEADER: 'inf'},
+    {DEADLINE_HEADER: 'NaN'},
+])
+def test_invalid_deadline_headers(headers):
+    controller = AdmissionController()
+    with pytest.raises(ValueError):
+        controller.deadline_from_headers(headers)
+
+
+def test_non_finite_deadline_is_not_admitted():
+    controller = AdmissionController(max_concurrency=1, max_queue=1)
+    with pytest.raises(ValueError):
+        controller.acquire(float('nan'))
+    with pytest.raises(ValueError):
+        controller.acquire(float('inf'))
+
+
+def test_deadline_is_capped():
+    controller = AdmissionController(default_timeout=2.0, max_timeout=5.0)
+    now = time.time()
+    assert controller.deadline_from_headers({TIMEOUT_HEADER: '1000'}) == pytest.approx(now + 1, abs=0.5)
+    assert controller.deadline_from_headers({TIMEOUT_HEADER: '1e9'}) <= now + 5.5
+    assert controller.deadline_from_headers({DEADLINE_HEADER: str(now + 3600)}) <= now + 5.5
+    assert controller.deadline_from_headers({}) == pytest.approx(now + 2, abs=0.5)
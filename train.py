@@ -16,6 +16,20 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
 from preprocessing import DataPreprocessor
 from model import ChurnPredictor
+from segments import SegmentedChurnModel
+
+# Model search configuration
+SEARCH_MODEL_FAMILIES = False  # True also tries non-linear model families
+TIME_BUDGET_SECONDS = 300      # Wall-clock budget for tuning all model families
+LATENCY_SLO_MS = 5.0           # Maximum single-row p99 inference latency
+
+# Segmented models: one logistic regression per ContractRenewal/DataPlan segment
+TRAIN_SEGMENT_MODELS = False
+
+# Evaluation configuration
+N_BOOTSTRAP = 1000             # Bootstrap replicates for confidence intervals
+COST_FALSE_POSITIVE = 1.0      # Cost of a retention offer to a customer who would stay
+COST_FALSE_NEGATIVE = 5.0      # Cost of losing a churning customer
 
 
 def main():
@@ -34,34 +48,62 @@ def main():
     # Step 2: Model Training
     print("\n[STEP 2/4] Model Training")
     predictor = ChurnPredictor(random_state=42)
-    predictor.train_model(
-        data['X_train'], 
-        data['y_train'], 
-        hyperparameter_tuning=True
-    )
+    if SEARCH_MODEL_FAMILIES:
+        predictor.search_models(
+            data['X_train'],
+            data['y_train'],
+            data['X_test'],
+            data['y_test'],
+            time_budget=TIME_BUDGET_SECONDS,
+            latency_slo_ms=LATENCY_SLO_MS,
+            scaler=data['scaler']
+        )
+        if predictor.model_type != 'Logistic Regression':
+            print(f"\n⚠ Warning: {predictor.model_type} selected. The fused linear, float32 "
+                  f"and stacked shadow serving paths need a plain logistic regression "
+                  f"and will be disabled.")
+    else:
+        predictor.train_model(
+            data['X_train'], 
+            data['y_train'], 
+            hyperparameter_tuning=True
+        )
     
     # Step 3: Model Evaluation
     print("\n[STEP 3/4] Model Evaluation")
     metrics = predictor.evaluate_model(
         data['X_test'], 
         data['y_test'], 
-        feature_names=data['feature_names']
+        feature_names=data['feature_names'],
+        n_bootstrap=N_BOOTSTRAP,
+        cost_fp=COST_FALSE_POSITIVE,
+        cost_fn=COST_FALSE_NEGATIVE
     )
     
     # Generate visualizations
     print("\nGenerating visualizations...")
     predictor.plot_confusion_matrix(metrics['confusion_matrix'])
     predictor.plot_roc_curve(data['X_test'], data['y_test'])
-    predictor.plot_feature_importance()
+    importance_plotted = predictor.plot_feature_importance()
     
     # Step 4: Save Model
     print("\n[STEP 4/4] Saving Model")
     predictor.save_model('models/churn_model.pkl')
+    predictor.save_evaluation_report('models/evaluation_report.json')
+    
+    # Optional: per-segment models served from one stacked coefficient matrix
+    if TRAIN_SEGMENT_MODELS:
+        print("\nTraining segment models...")
+        segmented = SegmentedChurnModel(data['feature_names'], random_state=42)
+        segmented.fit(data['X_train_raw'], data['y_train'], data['scaler'])
+        segmented.evaluate(data['X_test_raw'], data['y_test'])
+        segmented.save('models/segment_models.pkl')
     
     # Summary
     print("\n" + "="*80)
     print("MODEL TRAINING COMPLETED SUCCESSFULLY!")
     print("="*80)
+    print(f"\nSelected Model: {predictor.model_type}")
     print("\nModel Performance Summary:")
     print(f"  Accuracy:  {metrics['accuracy']:.4f}")
     print(f"  Precision: {metrics['precision']:.4f}")
@@ -73,9 +115,14 @@ def main():
     print("  ✓ models/churn_model.pkl")
     print("  ✓ models/scaler.pkl")
     print("  ✓ models/feature_names.pkl")
+    print("  ✓ models/data_profile.json")
+    print("  ✓ models/evaluation_report.json")
+    if TRAIN_SEGMENT_MODELS:
+        print("  ✓ models/segment_models.pkl")
     print("  ✓ models/confusion_matrix.png")
     print("  ✓ models/roc_curve.png")
-    print("  ✓ models/feature_importance.png")
+    if importance_plotted:
+        print("  ✓ models/feature_importance.png")
     
     print("\nNext Steps:")
     print("  1. Review the model performance metrics")